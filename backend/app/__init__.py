@@ -2,18 +2,21 @@
 
 import os
 from flask import Flask
-from flask_cors import CORS
-from flask_jwt_extended import JWTManager
 
-from .config import config
+from .config import Config, config
 from .models.database import db
 
+# Blueprint URL prefixes (API_PREFIX is fixed by design, not per-environment)
+AUTH_URL_PREFIX = f"{Config.API_PREFIX}/auth"
 
-def create_app(config_name=None):
+
+def create_app(config_name=None, overrides=None):
     """Create and configure the Flask application.
     
     Args:
         config_name: Configuration to use (development, production, testing)
+        overrides: Optional dict of config values applied on top of the
+            configuration class (e.g. a per-worker SQLALCHEMY_DATABASE_URI)
     
     Returns:
         Flask application instance
@@ -24,23 +27,36 @@ def create_app(config_name=None):
     app = Flask(__name__)
     
     # Load configuration
-    app.config.from_object(config[config_name])
+    config_class = config[config_name]
+    config_class.validate()
+    app.config.from_object(config_class)
+    if overrides:
+        app.config.update(overrides)
+    
+    # Initialize extensions (imported here so importing the package stays cheap)
+    from flask_cors import CORS
+    from .utils.json_provider import ORJSONProvider
+    from .utils.jwt_utils import CachedJWTManager
+    from .utils.rate_limit import limiter
     
-    # Initialize extensions
+    app.json = ORJSONProvider(app)
     db.init_app(app)
-    CORS(app)
-    JWTManager(app)
+    CORS(
+        app,
+        resources={f"{Config.API_PREFIX}/*": {'origins': app.config['CORS_ORIGINS']}},
+        max_age=app.config['CORS_PREFLIGHT_MAX_AGE']
+    )
+    CachedJWTManager(app)
+    limiter.init_app(app)
     
     # Create tables (for development - in production use migrations)
-    with app.app_context():
-        # Import models to ensure they're registered
-        from .models import entities
-        
-        # Create all tables
-        db.create_all()
+    # Models are registered on db.metadata when app.models is imported
+    if app.config['AUTO_CREATE_TABLES']:
+        with app.app_context():
+            db.create_all()
     
     # Register error handlers
-    from werkzeug.exceptions import BadRequest
+    from werkzeug.exceptions import BadRequest, ServiceUnavailable, TooManyRequests
     from pydantic import ValidationError
     
     @app.errorhandler(BadRequest)
@@ -56,12 +72,23 @@ def create_app(config_name=None):
         """Handle Pydantic validation errors."""
         return {'error': 'Validation Error', 'details': e.errors()}, 422
     
+    @app.errorhandler(ServiceUnavailable)
+    def handle_service_unavailable(e):
+        """Handle overload errors as JSON, keeping the Retry-After header."""
+        headers = {'Retry-After': str(e.retry_after)} if e.retry_after else {}
+        return {'error': e.description}, 503, headers
+    
+    @app.errorhandler(TooManyRequests)
+    def handle_too_many_requests(e):
+        """Handle rate limit errors as JSON."""
+        return {'error': f"Rate limit exceeded: {e.description}"}, 429
+    
     # Register blueprints
     from .blueprints.auth.routes import auth_bp
     
-    app.register_blueprint(auth_bp, url_prefix=f"{app.config['API_PREFIX']}/auth")
+    app.register_blueprint(auth_bp, url_prefix=AUTH_URL_PREFIX)
     
-    # TODO: Add more blueprints as they are created
+    # TODO: Add more blueprints as they are created (with *_URL_PREFIX constants above)
     # from .blueprints.users.routes import users_bp
     # from .blueprints.meals.routes import meals_bp
     # app.register_blueprint(users_bp, url_prefix=f"{app.config['API_PREFIX']}/users")
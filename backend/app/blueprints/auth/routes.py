@@ -1,20 +1,40 @@
 """Authentication routes for user registration, login, and profile."""
 
-from flask import Blueprint, jsonify, request
+import hashlib
+
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from werkzeug.exceptions import ServiceUnavailable
 from app.utils.validation import validate_with_422 as validate
 from app.schemas.user_schemas import (
     UserRegisterSchema, 
     UserLoginSchema, 
-    UserResponseSchema,
-    TokenResponseSchema
+    user_to_response_dict
 )
 from app.services.auth_service import AuthService
+from app.utils.jwt_utils import get_current_user, revoke_current_token
+from app.utils.rate_limit import limiter
 
 # Create blueprint
 auth_bp = Blueprint('auth', __name__)
 
 
+def _token_response(user, access_token: str, expires_in: int) -> dict:
+    """Build the TokenResponseSchema-shaped response body."""
+    return {
+        'access_token': access_token,
+        'token_type': 'bearer',
+        'expires_in': expires_in,
+        'user': user_to_response_dict(user)
+    }
+
+
+def _profile_etag(profile: dict) -> str:
+    """Derive the profile ETag from the user's ID and last update time."""
+    version = f"{profile['id']}:{profile['updated_at'].timestamp()}"
+    return hashlib.blake2b(version.encode('utf-8'), digest_size=8).hexdigest()
+
+
 @auth_bp.route('/register', methods=['POST'])
 @validate()
 def register(body: UserRegisterSchema):
@@ -27,28 +47,25 @@ def register(body: UserRegisterSchema):
     Returns:
         201: User created successfully with JWT token
         400: Validation error or user already exists
+        503: Too many concurrent password hashes (retry later)
     """
     try:
         # Register user and generate token for immediate login
         user, access_token, expires_in = AuthService.register_user_with_token(body)
         
-        # Create response
-        user_response = UserResponseSchema.from_orm(user)
-        token_response = TokenResponseSchema(
-            access_token=access_token,
-            expires_in=expires_in,
-            user=user_response
-        )
-        
-        return jsonify(token_response.dict()), 201
+        return jsonify(_token_response(user, access_token, expires_in)), 201
         
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
+    except ServiceUnavailable:
+        # Password hashing is saturated; let the app-level handler return 503
+        raise
     except Exception as e:
         return jsonify({"error": "Registration failed"}), 500
 
 
 @auth_bp.route('/login', methods=['POST'])
+@limiter.limit(lambda: current_app.config['LOGIN_RATE_LIMIT'])
 @validate()
 def login(body: UserLoginSchema):
     """
@@ -60,23 +77,20 @@ def login(body: UserLoginSchema):
     Returns:
         200: Login successful with JWT token
         401: Invalid credentials
+        429: Too many login attempts from this client
+        503: Too many concurrent password checks (retry later)
     """
     try:
         # Authenticate user
         user, access_token, expires_in = AuthService.authenticate_user(body)
         
-        # Create response
-        user_response = UserResponseSchema.from_orm(user)
-        token_response = TokenResponseSchema(
-            access_token=access_token,
-            expires_in=expires_in,
-            user=user_response
-        )
-        
-        return jsonify(token_response.dict()), 200
+        return jsonify(_token_response(user, access_token, expires_in)), 200
         
     except ValueError as e:
         return jsonify({"error": str(e)}), 401
+    except ServiceUnavailable:
+        # Password hashing is saturated; let the app-level handler return 503
+        raise
     except Exception as e:
         return jsonify({"error": "Login failed"}), 500
 
@@ -90,7 +104,8 @@ def get_profile():
     Requires JWT token in Authorization header.
     
     Returns:
-        200: User profile data
+        200: User profile data (with ETag)
+        304: Not modified (If-None-Match matches the current ETag)
         401: Unauthorized (invalid/missing token)
         404: User not found
     """
@@ -98,13 +113,21 @@ def get_profile():
         # Get current user ID from JWT
         user_id = get_jwt_identity()
         
-        # Get user data
-        user = AuthService.get_user_by_id(user_id)
+        # Get user profile data (cached per process); on a miss, load the
+        # user through the request-scoped helper so it is fetched only once
+        profile = AuthService.get_user_profile(user_id, load_user=get_current_user)
         
-        # Create response
-        user_response = UserResponseSchema.from_orm(user)
+        # Skip serialization entirely when the client's copy is current
+        etag = _profile_etag(profile)
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = jsonify(profile)
         
-        return jsonify(user_response.dict()), 200
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.max_age = 30
+        return response
         
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
@@ -123,8 +146,8 @@ def logout():
     Returns:
         200: Logout successful
     """
-    # In a stateless JWT system, logout is handled client-side
-    # The client should discard the token
-    # For enhanced security, you could implement a token blacklist
+    # The client should discard the token; additionally deny it in this
+    # process until it expires (other processes still accept it until then)
+    revoke_current_token()
     
     return jsonify({"message": "Logout successful"}), 200
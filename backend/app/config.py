@@ -1,65 +1,160 @@
 """Flask application configuration."""
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables from .env file in project root
+# .env file in project root
 project_root = Path(__file__).parent.parent.parent  # Go up from app/ to backend/ to project root/
 env_path = project_root / '.env'
-load_dotenv(env_path)
+
+
+@lru_cache(maxsize=1)
+def _load_env() -> None:
+    """Load the .env file (once per process)."""
+    load_dotenv(env_path)
+
+
+@lru_cache(maxsize=None)
+def _env(name: str, default: str | None = None) -> str | None:
+    """Read an environment variable (after loading .env), memoized per process."""
+    _load_env()
+    return os.getenv(name, default)
 
 
 class Config:
     """Base configuration."""
     
+    # Settings that must come from the environment (checked by validate())
+    REQUIRED_SETTINGS = ('SECRET_KEY', 'JWT_SECRET_KEY', 'JWT_ACCESS_TOKEN_EXPIRES')
+    
     # Flask - REQUIRED
-    SECRET_KEY = os.getenv('SECRET_KEY')
-    if not SECRET_KEY:
-        raise ValueError("SECRET_KEY environment variable is not set")
+    SECRET_KEY = _env('SECRET_KEY')
     
     # Database - Use DEV_DATABASE_URL (required for development/production)
     # TestingConfig will override this with TEST_DATABASE_URL
-    SQLALCHEMY_DATABASE_URI = os.getenv('DEV_DATABASE_URL', 'postgresql://placeholder')
+    SQLALCHEMY_DATABASE_URI = _env('DEV_DATABASE_URL', 'postgresql://placeholder')
     # Note: We use a placeholder to avoid errors during import when testing
     # The actual database URL will be set by TestingConfig
     
+    # Run db.create_all() in create_app; production schemas come from migrations
+    AUTO_CREATE_TABLES = _env('AUTO_CREATE_TABLES', 'False').lower() == 'true'
+    
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ECHO = os.getenv('SQLALCHEMY_ECHO', 'False').lower() == 'true'
+    SQLALCHEMY_ECHO = _env('SQLALCHEMY_ECHO', 'False').lower() == 'true'
+    
+    # Connection pool - sized via DB_POOL_SIZE / DB_MAX_OVERFLOW
+    # LIFO reuse keeps the same few Postgres backends warm under light load
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(_env('DB_POOL_SIZE', '10')),
+        'max_overflow': int(_env('DB_MAX_OVERFLOW', '10')),
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,  # seconds
+        'pool_use_lifo': True,
+    }
     
     # JWT - REQUIRED
-    JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
-    if not JWT_SECRET_KEY:
-        raise ValueError("JWT_SECRET_KEY environment variable is not set")
+    JWT_SECRET_KEY = _env('JWT_SECRET_KEY')
+    # Pinned so signing stays on HMAC-SHA256 (hardware-accelerated on
+    # SHA-NI / ARMv8 crypto CPUs) and decoding never accepts other algorithms
+    JWT_ALGORITHM = 'HS256'
+    JWT_DECODE_ALGORITHMS = ['HS256']
+    
+    JWT_ACCESS_TOKEN_EXPIRES_STR = _env('JWT_ACCESS_TOKEN_EXPIRES')
+    JWT_ACCESS_TOKEN_EXPIRES = int(JWT_ACCESS_TOKEN_EXPIRES_STR) if JWT_ACCESS_TOKEN_EXPIRES_STR else None
+    
+    # Verified JWT payload cache (see CachedJWTManager)
+    AUTH_CACHE_ENABLED = _env('AUTH_CACHE_ENABLED', 'True').lower() == 'true'
+    AUTH_CACHE_TTL = int(_env('AUTH_CACHE_TTL', '30'))  # seconds
+    AUTH_CACHE_MAXSIZE = int(_env('AUTH_CACHE_MAXSIZE', '10000'))
+    
+    # Serialized user profile cache (see AuthService.get_user_profile)
+    USER_CACHE_ENABLED = _env('USER_CACHE_ENABLED', 'True').lower() == 'true'
     
-    JWT_ACCESS_TOKEN_EXPIRES_STR = os.getenv('JWT_ACCESS_TOKEN_EXPIRES')
-    if not JWT_ACCESS_TOKEN_EXPIRES_STR:
-        raise ValueError("JWT_ACCESS_TOKEN_EXPIRES environment variable is not set")
-    JWT_ACCESS_TOKEN_EXPIRES = int(JWT_ACCESS_TOKEN_EXPIRES_STR)
+    # Skip bcrypt for logins repeated within 5 minutes (off by default: a
+    # process compromise would expose recently verified credentials' MACs)
+    USE_VERIFY_PASSWORD_CACHE = _env('USE_VERIFY_PASSWORD_CACHE', 'False').lower() == 'true'
+    
+    # bcrypt cost factor for new password hashes (each +1 doubles the work)
+    BCRYPT_ROUNDS = int(_env('BCRYPT_ROUNDS', '12'))
+    
+    # Concurrent bcrypt operations per process, and how long (seconds) a
+    # request waits for a free slot before getting 503 + Retry-After
+    BCRYPT_MAX_CONCURRENCY = int(_env('BCRYPT_MAX_CONCURRENCY', str(os.cpu_count() or 1)))
+    BCRYPT_QUEUE_TIMEOUT = float(_env('BCRYPT_QUEUE_TIMEOUT', '5'))
+    
+    # Per-IP rate limiting (Flask-Limiter). The default in-memory storage is
+    # per process; point RATELIMIT_STORAGE_URI at Redis/Memcached to share it.
+    RATELIMIT_ENABLED = _env('RATELIMIT_ENABLED', 'True').lower() == 'true'
+    RATELIMIT_STORAGE_URI = _env('RATELIMIT_STORAGE_URI', 'memory://')
+    LOGIN_RATE_LIMIT = _env('LOGIN_RATE_LIMIT', '10/minute')
     
     # API - Hardcoded as part of application design
     API_PREFIX = '/api'
+    
+    # flask-pydantic returns this status for request validation errors
+    FLASK_PYDANTIC_VALIDATION_ERROR_STATUS_CODE = 422
+    
+    # CORS - comma-separated origins allowed to call the API ('*' for any)
+    CORS_ORIGINS = [origin.strip() for origin in _env('CORS_ORIGINS', '*').split(',')]
+    CORS_PREFLIGHT_MAX_AGE = 86400  # Let browsers cache preflight responses for 24h
+    
+    @classmethod
+    def validate(cls) -> None:
+        """
+        Check that all required settings were provided.
+        
+        Raises:
+            ValueError: If a required environment variable is not set
+        """
+        for name in cls.REQUIRED_SETTINGS:
+            if not getattr(cls, name):
+                raise ValueError(f"{name} environment variable is not set")
 
 
 class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
     TESTING = False
+    AUTO_CREATE_TABLES = True
 
 
 class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
     TESTING = False
+    
+    # Larger pool for concurrent API traffic
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        **Config.SQLALCHEMY_ENGINE_OPTIONS,
+        'pool_size': int(_env('DB_POOL_SIZE', '25')),
+        'max_overflow': int(_env('DB_MAX_OVERFLOW', '25')),
+    }
 
 
 class TestingConfig(Config):
     """Testing configuration."""
     DEBUG = True
     TESTING = True
+    AUTO_CREATE_TABLES = True
     
     # Override database URL for testing if TEST_DATABASE_URL is set
-    SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URL', Config.SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_DATABASE_URI = _env('TEST_DATABASE_URL', Config.SQLALCHEMY_DATABASE_URI)
+    
+    # Tests run serially, so keep the pool small
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        **Config.SQLALCHEMY_ENGINE_OPTIONS,
+        'pool_size': 2,
+        'max_overflow': 0,
+    }
+    
+    # Always run the full JWT verification and user lookup in tests
+    AUTH_CACHE_ENABLED = False
+    USER_CACHE_ENABLED = False
+    
+    # Minimum bcrypt cost; test passwords need no protection
+    BCRYPT_ROUNDS = 4
 
 
 # Configuration dictionary
@@ -0,0 +1,4 @@
+"""Database models."""
+
+# Import entities so every model is registered on db.metadata
+from . import entities  # noqa: F401
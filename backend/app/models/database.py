@@ -2,7 +2,9 @@
 
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import MetaData
+from sqlalchemy import DateTime, MetaData
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 
 # Define naming convention for constraints
 convention = {
@@ -14,6 +16,23 @@ convention = {
 }
 
 
+class utcnow(FunctionElement):
+    """Current UTC timestamp, evaluated by the database (for server-side defaults)."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, 'postgresql')
+def _pg_utcnow(element, compiler, **kw):
+    # now() is timestamptz; convert explicitly so naive columns always hold UTC
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
 class Base(DeclarativeBase):
     """Base class for all database models."""
     metadata = MetaData(naming_convention=convention)
@@ -1,13 +1,13 @@
 """SQLAlchemy model entities for the meal planner application."""
 
-from datetime import datetime
 from enum import Enum
 from sqlalchemy import (
     Column, Integer, String, Float, Boolean, DateTime, Date, 
     ForeignKey, Text, UniqueConstraint, Index
 )
+from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from .database import db
+from .database import db, utcnow
 
 
 class SexEnum(str, Enum):
@@ -40,6 +40,8 @@ class FoodCategoryEnum(str, Enum):
 class User(db.Model):
     """User model for authentication and profile information."""
     __tablename__ = 'USER'
+    # Fetch server-generated timestamps via RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {'eager_defaults': True}
     
     # Primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -51,7 +53,7 @@ class User(db.Model):
     
     # Profile fields
     full_name = Column(String(255), nullable=False)
-    sex = Column(String(20), nullable=False)  # MALE, FEMALE, OTHER - Required
+    sex = Column(SQLEnum(SexEnum, name='sex_enum', native_enum=True), nullable=False)  # Required
     phone_number = Column(String(50), nullable=True)
     
     # Address fields
@@ -63,8 +65,8 @@ class User(db.Model):
     postal_code = Column(String(20), nullable=False)  # Required
     
     # Timestamps
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow())
+    updated_at = Column(DateTime, nullable=False, server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
     favorite_foods = relationship('FoodUserLikes', back_populates='user', cascade='all, delete-orphan')
@@ -77,13 +79,18 @@ class User(db.Model):
 class Food(db.Model):
     """Food model for storing food items and their nutritional information."""
     __tablename__ = 'FOOD_CATALOG'
+    # Fetch server-generated timestamps via RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {'eager_defaults': True}
     
     # Primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
     
     # Food information
     name = Column(String(255), nullable=False, unique=True, index=True)
-    category = Column(String(50), nullable=False, index=True)  # Uses FoodCategoryEnum values
+    category = Column(
+        SQLEnum(FoodCategoryEnum, name='food_category_enum', native_enum=True),
+        nullable=False, index=True
+    )
     
     # Nutritional information (per serving)
     calories = Column(Float, nullable=False, default=0)
@@ -100,8 +107,8 @@ class Food(db.Model):
     non_inflammatory = Column(Boolean, nullable=False, default=False)
     
     # Timestamps
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow())
+    updated_at = Column(DateTime, nullable=False, server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
     user_likes = relationship('FoodUserLikes', back_populates='food', cascade='all, delete-orphan')
@@ -114,6 +121,8 @@ class Food(db.Model):
 class Meal(db.Model):
     """Meal model for storing meal combinations."""
     __tablename__ = 'MEAL'
+    # Fetch server-generated timestamps via RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {'eager_defaults': True}
     
     # Primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -132,8 +141,8 @@ class Meal(db.Model):
     prep_time = Column(Integer, nullable=True)  # in minutes
     
     # Timestamps
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow())
+    updated_at = Column(DateTime, nullable=False, server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
     user_meals = relationship('UserMeal', back_populates='meal', cascade='all, delete-orphan')
@@ -155,7 +164,7 @@ class FoodUserLikes(db.Model):
     food_id = Column(Integer, ForeignKey('FOOD_CATALOG.id', ondelete='CASCADE'), nullable=False)
     
     # Timestamp
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow())
     
     # Relationships
     user = relationship('User', back_populates='favorite_foods')
@@ -188,7 +197,7 @@ class UserMeal(db.Model):
     meal_number = Column(Integer, nullable=False)  # 1=breakfast, 2=lunch, 3=dinner, 4=snack, etc.
     
     # Timestamp
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow())
     
     # Relationships
     user = relationship('User', back_populates='meals')
@@ -221,7 +230,7 @@ class MealIngredients(db.Model):
     notes = Column(Text, nullable=True)
     
     # Timestamp
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow())
     
     # Relationships
     meal = relationship('Meal', back_populates='ingredients')
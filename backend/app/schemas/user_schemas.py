@@ -1,10 +1,16 @@
 """Pydantic schemas for user-related operations."""
 
-from pydantic import BaseModel, EmailStr, Field, validator
+import re
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from typing import Optional
 from datetime import datetime
 from enum import Enum
 
+# Precompiled character checks for registration validators
+_USERNAME_RE = re.compile(r'\A[A-Za-z0-9_-]+\Z')
+_HAS_DIGIT = re.compile(r'\d').search
+_HAS_ALPHA = re.compile(r'[^\W\d_]').search
+
 
 class SexEnum(str, Enum):
     """Sex enumeration matching database model."""
@@ -28,24 +34,26 @@ class UserRegisterSchema(BaseModel):
     country_code: str = Field(..., min_length=2, max_length=2)  # Required
     postal_code: str = Field(..., min_length=1, max_length=20)  # Required
 
-    @validator('username')
+    @field_validator('username')
+    @classmethod
     def username_valid_chars(cls, v):
         """Validate username contains only alphanumeric characters, underscores, and hyphens."""
-        allowed_chars = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-')
-        if not all(char in allowed_chars for char in v):
+        if not _USERNAME_RE.match(v):
             raise ValueError('Username must contain only letters, numbers, underscores, and hyphens')
         return v
 
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def password_strength(cls, v):
         """Basic password strength validation."""
-        if not any(char.isdigit() for char in v):
+        if not _HAS_DIGIT(v):
             raise ValueError('Password must contain at least one digit')
-        if not any(char.isalpha() for char in v):
+        if not _HAS_ALPHA(v):
             raise ValueError('Password must contain at least one letter')
         return v
 
-    @validator('country_code')
+    @field_validator('country_code')
+    @classmethod
     def country_code_uppercase(cls, v):
         """Ensure country code is uppercase."""
         return v.upper()
@@ -69,7 +77,8 @@ class UserUpdateSchema(BaseModel):
     country_code: Optional[str] = Field(None, min_length=2, max_length=2)
     postal_code: Optional[str] = Field(None, min_length=1, max_length=20)
 
-    @validator('country_code')
+    @field_validator('country_code')
+    @classmethod
     def country_code_uppercase(cls, v):
         """Ensure country code is uppercase if provided."""
         if v:
@@ -94,9 +103,21 @@ class UserResponseSchema(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        """Pydantic configuration."""
-        from_attributes = True  # This allows compatibility with SQLAlchemy models
+    model_config = ConfigDict(from_attributes=True)  # Allows model_validate() on SQLAlchemy models
+
+
+# Response fields in schema order, used by user_to_response_dict
+USER_RESPONSE_FIELDS = tuple(UserResponseSchema.model_fields)
+
+
+def user_to_response_dict(user) -> dict:
+    """
+    Serialize a User entity to the UserResponseSchema shape.
+    
+    Database rows are already valid, so this reads the attributes directly
+    instead of building and re-dumping a UserResponseSchema instance.
+    """
+    return {field: getattr(user, field) for field in USER_RESPONSE_FIELDS}
 
 
 class TokenResponseSchema(BaseModel):
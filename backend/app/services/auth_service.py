@@ -1,11 +1,55 @@
 """Authentication service for user registration and login."""
 
-import bcrypt
+import hashlib
+import os
+import threading
+from typing import Callable, Optional
+
+from cachetools import TTLCache
+from flask import current_app
+from sqlalchemy import exists
 from sqlalchemy.exc import IntegrityError
 from app.models.database import db
 from app.models.entities import User
-from app.schemas.user_schemas import UserRegisterSchema, UserLoginSchema
+from app.schemas.user_schemas import UserRegisterSchema, UserLoginSchema, user_to_response_dict
 from app.utils.jwt_utils import generate_token
+from app.utils.passwords import check_password, dummy_password_hash, hash_password
+
+# Per-process cache of serialized user profiles, keyed by user ID
+_user_profile_cache = TTLCache(maxsize=5000, ttl=60)
+_user_profile_cache_lock = threading.Lock()
+
+# Per-process cache of recently verified (password, hash) pairs. Keys are a
+# BLAKE2b MAC under a random per-process key, so the cache never holds
+# anything that could be checked offline faster than bcrypt itself.
+_verified_password_cache = TTLCache(maxsize=1024, ttl=300)
+_verified_password_cache_lock = threading.Lock()
+_verified_password_key = os.urandom(32)
+
+
+def _check_password(password: str, password_hash: str) -> bool:
+    """Verify a password against its bcrypt hash, optionally using the verify cache."""
+    if not current_app.config['USE_VERIFY_PASSWORD_CACHE']:
+        return check_password(password, password_hash)
+    
+    # Encode once; the bytes feed both the cache key and bcrypt
+    password_bytes = password.encode('utf-8')
+    hash_bytes = password_hash.encode('utf-8')
+    
+    key = hashlib.blake2b(
+        password_bytes + b'\0' + hash_bytes, key=_verified_password_key, digest_size=32
+    ).digest()
+    with _verified_password_cache_lock:
+        if key in _verified_password_cache:
+            return True
+    
+    if not check_password(password_bytes, hash_bytes):
+        return False
+    
+    # Only successful verifications are cached
+    with _verified_password_cache_lock:
+        _verified_password_cache[key] = True
+    return True
 
 
 class AuthService:
@@ -25,23 +69,8 @@ class AuthService:
         Raises:
             ValueError: If username or email already exists
         """
-        # Check if user already exists
-        existing_user = User.query.filter(
-            (User.email == user_data.email) | 
-            (User.username == user_data.username)
-        ).first()
-        
-        if existing_user:
-            if existing_user.email == user_data.email:
-                raise ValueError("Email already registered")
-            else:
-                raise ValueError("Username already taken")
-        
         # Hash the password
-        password_hash = bcrypt.hashpw(
-            user_data.password.encode('utf-8'), 
-            bcrypt.gensalt()
-        ).decode('utf-8')
+        password_hash = hash_password(user_data.password)
         
         # Create new user
         new_user = User(
@@ -59,12 +88,20 @@ class AuthService:
             postal_code=user_data.postal_code
         )
         
+        # Insert directly and let the unique constraints detect duplicates:
+        # one round-trip on the happy path and no check-then-insert race
         try:
             db.session.add(new_user)
             db.session.commit()
             return new_user
         except IntegrityError as e:
             db.session.rollback()
+            
+            # Work out which unique constraint was violated
+            if db.session.query(exists().where(User.email == user_data.email)).scalar():
+                raise ValueError("Email already registered") from e
+            if db.session.query(exists().where(User.username == user_data.username)).scalar():
+                raise ValueError("Username already taken") from e
             raise ValueError("Failed to create user") from e
     
     @staticmethod
@@ -103,20 +140,19 @@ class AuthService:
         Raises:
             ValueError: If credentials are invalid
         """
-        # Find user by email or username
-        user = User.query.filter(
-            (User.email == login_data.login) | 
-            (User.username == login_data.login)
-        ).first()
+        # Find user by email or username. Usernames cannot contain '@', so the
+        # login value maps to exactly one unique index instead of an OR scan.
+        login_column = User.email if '@' in login_data.login else User.username
+        user = User.query.filter(login_column == login_data.login).first()
         
         if not user:
+            # Spend the same bcrypt work as a wrong password so unknown
+            # logins cannot be told apart by timing
+            check_password(login_data.password, dummy_password_hash())
             raise ValueError("Invalid credentials")
         
         # Verify password
-        if not bcrypt.checkpw(
-            login_data.password.encode('utf-8'),
-            user.password_hash.encode('utf-8')
-        ):
+        if not _check_password(login_data.password, user.password_hash):
             raise ValueError("Invalid credentials")
         
         # Generate JWT token
@@ -138,7 +174,62 @@ class AuthService:
         Raises:
             ValueError: If user not found
         """
-        user = User.query.get(user_id)
+        # Session.get checks the identity map before issuing a SELECT
+        user = db.session.get(User, int(user_id))
         if not user:
             raise ValueError("User not found")
         return user
+    
+    @staticmethod
+    def get_user_profile(user_id: int, load_user: Optional[Callable[[], Optional[User]]] = None) -> dict:
+        """
+        Get a user's public profile data.
+        
+        Profiles are cached per process for a short time so repeated
+        requests from the same user skip the database round-trip.
+        The returned dict is shared with the cache and must not be modified.
+        
+        Args:
+            user_id: User's database ID
+            load_user: Optional loader for the user on a cache miss (e.g.
+                get_current_user, so the request reuses its one lookup);
+                defaults to get_user_by_id
+            
+        Returns:
+            Dict with UserResponseSchema fields
+            
+        Raises:
+            ValueError: If user not found
+        """
+        user_id = int(user_id)
+        use_cache = current_app.config['USER_CACHE_ENABLED']
+        
+        if use_cache:
+            with _user_profile_cache_lock:
+                profile = _user_profile_cache.get(user_id)
+            if profile is not None:
+                return profile
+        
+        if load_user is None:
+            user = AuthService.get_user_by_id(user_id)
+        else:
+            user = load_user()
+            if user is None:
+                raise ValueError("User not found")
+        profile = user_to_response_dict(user)
+        
+        if use_cache:
+            with _user_profile_cache_lock:
+                _user_profile_cache[user_id] = profile
+        return profile
+    
+    @staticmethod
+    def invalidate_user_profile(user_id: int) -> None:
+        """
+        Drop a user's cached profile (call after updating the user).
+        
+        Args:
+            user_id: User's database ID
+        """
+        with _user_profile_cache_lock:
+            _user_profile_cache.pop(int(user_id), None)
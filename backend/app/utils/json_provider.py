@@ -0,0 +1,44 @@
+"""orjson-backed JSON provider for Flask."""
+
+import decimal
+
+import orjson
+from flask.json.provider import JSONProvider
+
+# Naive timestamps are produced in UTC by the database default
+# (TIMEZONE('utc', CURRENT_TIMESTAMP)), so tag them as such
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def _default(o):
+    """Serialize types orjson does not handle natively."""
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    JSON provider that encodes and decodes with orjson.
+    
+    Datetimes are emitted as ISO 8601 strings. Keys keep insertion order
+    (Flask's default provider sorts them).
+    """
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS),
+            mimetype='application/json'
+        )
@@ -1,8 +1,93 @@
 """JWT utility functions for authentication."""
 
-from flask_jwt_extended import create_access_token, get_jwt_identity
+import hashlib
+import heapq
+import threading
+import time
+
+from cachetools import TLRUCache
+from flask_jwt_extended import JWTManager, create_access_token, get_jwt, get_jwt_identity
 from datetime import timedelta
-from flask import current_app
+from flask import current_app, g
+
+
+class CachedJWTManager(JWTManager):
+    """
+    JWTManager that caches verified token payloads for a short time.
+
+    Clients present the same access token on every request, so the signature
+    check and claim parsing are repeated for identical input. Verified payloads
+    are kept in a TTL cache keyed by a BLAKE2b hash of the token (the raw token
+    is never stored). Entries expire after AUTH_CACHE_TTL seconds or when the
+    token itself expires, whichever comes first.
+
+    Logged-out tokens are recorded by JTI in a per-process denylist until they
+    expire, and rejected by the blocklist check that runs after decoding. The
+    denylist is not size-capped: an entry is only dropped once its token has
+    expired, so revocations never depend on cache pressure.
+    """
+
+    def __init__(self, app=None, add_context_processor: bool = False) -> None:
+        self._token_cache = None
+        self._token_cache_lock = threading.Lock()
+        self._revoked_tokens = {}  # JTI -> token expiry (epoch seconds)
+        self._revocation_expiries = []  # Heap of (exp, jti) for pruning
+        super().__init__(app, add_context_processor)
+
+    def init_app(self, app, add_context_processor: bool = False) -> None:
+        super().init_app(app, add_context_processor)
+        
+        ttl = app.config['AUTH_CACHE_TTL']
+        self._token_cache = TLRUCache(
+            maxsize=app.config['AUTH_CACHE_MAXSIZE'],
+            ttu=lambda _key, payload, now: min(now + ttl, payload.get('exp', now + ttl)),
+            timer=time.time  # Same clock as the token's 'exp' claim
+        )
+        self.token_in_blocklist_loader(self._is_token_revoked)
+
+    def _decode_jwt_from_config(
+        self, encoded_token: str, csrf_value=None, allow_expired: bool = False
+    ) -> dict:
+        # Only the plain verification path is cached; CSRF and expired-token
+        # checks always go through the full decode
+        if (
+            not current_app.config['AUTH_CACHE_ENABLED']
+            or csrf_value is not None
+            or allow_expired
+        ):
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        
+        key = hashlib.blake2b(encoded_token.encode('utf-8'), digest_size=16).digest()
+        with self._token_cache_lock:
+            payload = self._token_cache.get(key)
+        if payload is not None:
+            return payload
+        
+        payload = super()._decode_jwt_from_config(encoded_token)
+        with self._token_cache_lock:
+            self._token_cache[key] = payload
+        return payload
+
+    def revoke_token(self, jwt_payload: dict) -> None:
+        """Reject the given token for the rest of its lifetime (in this process)."""
+        jti = jwt_payload['jti']
+        exp = jwt_payload.get('exp', float('inf'))
+        with self._token_cache_lock:
+            self._prune_revoked_tokens(time.time())
+            self._revoked_tokens[jti] = exp
+            heapq.heappush(self._revocation_expiries, (exp, jti))
+    
+    def _prune_revoked_tokens(self, now: float) -> None:
+        # Expired tokens fail signature/claim checks anyway, so forget them
+        # (caller holds _token_cache_lock)
+        expiries = self._revocation_expiries
+        while expiries and expiries[0][0] <= now:
+            _exp, jti = heapq.heappop(expiries)
+            self._revoked_tokens.pop(jti, None)
+
+    def _is_token_revoked(self, _jwt_header: dict, jwt_payload: dict) -> bool:
+        with self._token_cache_lock:
+            return jwt_payload['jti'] in self._revoked_tokens
 
 
 def generate_token(user_id: int) -> tuple[str, int]:
@@ -35,3 +120,28 @@ def get_current_user_id() -> int:
         User ID from the JWT token
     """
     return int(get_jwt_identity())  # Convert string back to int
+
+
+def get_current_user():
+    """
+    Get the current authenticated user's entity, loading it at most once per request.
+    
+    The instance is kept on flask.g so auth helpers, decorators and the route
+    itself share a single primary-key lookup (and pooled connection).
+    Unlike a JWTManager user_lookup_loader, nothing is fetched for routes
+    that never ask for the user.
+    
+    Returns:
+        User entity, or None if the user no longer exists
+    """
+    if '_current_user' not in g:
+        from app.models.database import db
+        from app.models.entities import User
+        
+        g._current_user = db.session.get(User, get_current_user_id())
+    return g._current_user
+
+
+def revoke_current_token() -> None:
+    """Revoke the JWT used for the current request (e.g. on logout)."""
+    current_app.extensions['flask-jwt-extended'].revoke_token(get_jwt())
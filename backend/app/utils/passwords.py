@@ -0,0 +1,102 @@
+"""Password hashing helpers with bounded bcrypt concurrency."""
+
+import os
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+import bcrypt
+from flask import current_app
+from werkzeug.exceptions import ServiceUnavailable
+
+# bcrypt releases the GIL, so threaded workers already hash in parallel.
+# The semaphore caps how many hashes run at once per process: a burst of
+# logins waits briefly for a slot, and is turned away with 503 instead of
+# piling up behind a saturated CPU.
+_bcrypt_slots = None
+_bcrypt_slots_lock = threading.Lock()
+
+
+def _get_bcrypt_slots() -> threading.BoundedSemaphore:
+    """Create the per-process bcrypt semaphore on first use."""
+    global _bcrypt_slots
+    if _bcrypt_slots is None:
+        with _bcrypt_slots_lock:
+            if _bcrypt_slots is None:
+                _bcrypt_slots = threading.BoundedSemaphore(
+                    current_app.config['BCRYPT_MAX_CONCURRENCY']
+                )
+    return _bcrypt_slots
+
+
+@contextmanager
+def _bcrypt_slot():
+    """
+    Hold one bcrypt slot for the duration of the block.
+    
+    Raises:
+        ServiceUnavailable: If no slot frees up within BCRYPT_QUEUE_TIMEOUT seconds
+    """
+    slots = _get_bcrypt_slots()
+    if not slots.acquire(timeout=current_app.config['BCRYPT_QUEUE_TIMEOUT']):
+        raise ServiceUnavailable("Server is busy, please retry", retry_after=1)
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password with bcrypt using the configured cost (BCRYPT_ROUNDS).
+    
+    Args:
+        password: Plain-text password
+        
+    Returns:
+        bcrypt hash as a string
+    """
+    # Salt generation is a cheap urandom read; only hashpw needs a slot
+    salt = bcrypt.gensalt(rounds=current_app.config['BCRYPT_ROUNDS'])
+    with _bcrypt_slot():
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def _dummy_hash(rounds: int) -> bytes:
+    """Hash of a random, never-issued password at the given cost."""
+    return bcrypt.hashpw(os.urandom(16), bcrypt.gensalt(rounds=rounds))
+
+
+def dummy_password_hash() -> bytes:
+    """
+    Get a bcrypt hash that no password matches, at the configured cost.
+    
+    Checking a login against it when the user does not exist makes that
+    path take as long as a wrong password, so response times do not reveal
+    which emails and usernames are registered.
+    
+    Returns:
+        bcrypt hash as bytes
+    """
+    return _dummy_hash(current_app.config['BCRYPT_ROUNDS'])
+
+
+def check_password(password: str | bytes, password_hash: str | bytes) -> bool:
+    """
+    Verify a password against a bcrypt hash.
+    
+    Args:
+        password: Plain-text password (str, or already UTF-8 encoded)
+        password_hash: Stored bcrypt hash (str, or already encoded)
+        
+    Returns:
+        True if the password matches
+    """
+    if isinstance(password, str):
+        password = password.encode('utf-8')
+    if isinstance(password_hash, str):
+        password_hash = password_hash.encode('utf-8')
+    
+    with _bcrypt_slot():
+        return bcrypt.checkpw(password, password_hash)
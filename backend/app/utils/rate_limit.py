@@ -0,0 +1,8 @@
+"""Per-client request rate limiting."""
+
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+
+# Shared limiter, bound to the app in create_app. Storage and the on/off
+# switch come from the RATELIMIT_* config settings.
+limiter = Limiter(key_func=get_remote_address)
@@ -1,7 +1,7 @@
 """Custom validation utilities."""
 
 from functools import wraps
-from flask import jsonify, request
+from flask import jsonify
 from flask_pydantic import validate as flask_pydantic_validate
 from pydantic import ValidationError
 
@@ -13,6 +13,11 @@ def validate_with_422(*args, **kwargs):
     This ensures proper HTTP status codes:
     - 422 Unprocessable Entity for validation errors
     - 400 Bad Request for other client errors
+    
+    Request validation failures get their 422 from flask-pydantic itself via
+    FLASK_PYDANTIC_VALIDATION_ERROR_STATUS_CODE (set in Config), so responses
+    pass through untouched; only ValidationErrors raised inside the view
+    are converted here.
     """
     def decorator(func):
         # Apply flask-pydantic's validate decorator
@@ -21,32 +26,10 @@ def validate_with_422(*args, **kwargs):
         @wraps(flask_validated)
         def wrapper(*inner_args, **inner_kwargs):
             try:
-                # Call the flask-pydantic validated function
-                response = flask_validated(*inner_args, **inner_kwargs)
-                
-                # Check if this is a validation error response from flask-pydantic
-                if isinstance(response, tuple) and len(response) == 2:
-                    body, status_code = response
-                    if status_code == 400 and isinstance(body, dict) and 'validation_error' in body:
-                        # Change status code to 422 for validation errors
-                        return body, 422
-                elif hasattr(response, 'json') and hasattr(response, 'status_code'):
-                    # Handle Response objects
-                    if response.status_code == 400:
-                        try:
-                            data = response.get_json()
-                            if data and 'validation_error' in data:
-                                return jsonify(data), 422
-                        except:
-                            pass
-                
-                return response
+                return flask_validated(*inner_args, **inner_kwargs)
             except ValidationError as e:
                 # Handle direct Pydantic validation errors
                 return jsonify({'validation_error': e.errors()}), 422
-            except Exception as e:
-                # Let other exceptions bubble up
-                raise
         
         return wrapper
     return decorator
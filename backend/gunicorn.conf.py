@@ -0,0 +1,28 @@
+"""
+Gunicorn configuration for serving the API outside of Lambda.
+
+Usage:
+    gunicorn -c gunicorn.conf.py "app:create_app()"
+
+Each request spends most of its time waiting on PostgreSQL or bcrypt, so
+threaded workers serve many requests per process. Keep
+workers * threads within DB_POOL_SIZE + DB_MAX_OVERFLOW.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8088')}"
+
+# Threaded workers for I/O-bound request handling
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+
+# Keep client connections open between requests (seconds)
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '30'))
+
+# Recycle workers periodically; jitter avoids restarting them all at once
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = 100
+
+timeout = 30
@@ -5,37 +5,59 @@ Usage:
     python scripts/rebuild_db.py           # Use default database
     python scripts/rebuild_db.py --local   # Use local test database
     python scripts/rebuild_db.py --cloud   # Use cloud test database
+    python scripts/rebuild_db.py --force   # Drop the whole public schema first
 """
 
 import sys
 import os
 import argparse
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta
 
 # Add parent directory to path to import app modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+# Precomputed bcrypt hashes (cost 4) for the dev-only seed passwords, so
+# rebuilds do no hashing at all. Regenerate with:
+#   python -c "import bcrypt; print(bcrypt.hashpw(b'admin123', bcrypt.gensalt(4)).decode())"
+ADMIN_PASSWORD_HASH = '$2b$04$BRcnU1xvIwgOrj5/8OTkL.czHhq058U5XD.R8luuoV27dmITe9BZW'  # admin123
+USER_PASSWORD_HASH = '$2b$04$rENk0Xbb5E.r94d9FAm38unLlWFfmRpGBkYSK0nZDKyFF2t6Ago1m'  # password123
 
-def drop_all_tables():
-    """Drop all database tables with CASCADE to handle foreign keys."""
-    print("Dropping all tables...")
+
+def drop_all_tables(force=False):
+    """Drop all database tables with CASCADE to handle foreign keys.
+    
+    Args:
+        force: Drop and recreate the whole public schema in one statement,
+            removing every object in it (not just the model tables)
+    """
+    if force:
+        print("Dropping public schema...")
+        with db.engine.begin() as conn:
+            conn.execute(text('DROP SCHEMA public CASCADE'))
+            conn.execute(text('CREATE SCHEMA public'))
+        print("✓ Public schema dropped and recreated")
+        return
     
-    # Get all table names from metadata
-    tables = db.metadata.tables.keys()
+    print("Dropping all tables...")
     
-    if tables:
-        # Use raw SQL with CASCADE to drop all constraints and tables
-        with db.engine.connect() as conn:
-            # First, drop all tables with CASCADE (PostgreSQL specific)
-            # This will automatically handle foreign key constraints
-            for table in reversed(list(tables)):
-                try:
-                    conn.execute(text(f'DROP TABLE IF EXISTS "{table}" CASCADE'))
-                    conn.commit()
-                    print(f"  ✓ Dropped table {table}")
-                except Exception as e:
-                    print(f"  ✗ Error dropping table {table}: {e}")
-                    conn.rollback()
+    # Get all table names and native enum types from metadata
+    tables = list(db.metadata.tables.values())
+    enum_types = sorted({
+        column.type.name
+        for table in tables
+        for column in table.columns
+        if isinstance(column.type, Enum) and column.type.native_enum
+    })
+    
+    # Drop everything in one transaction; CASCADE (PostgreSQL specific)
+    # handles foreign keys regardless of drop order
+    with db.engine.begin() as conn:
+        for table in tables:
+            conn.execute(text(f'DROP TABLE IF EXISTS "{table.name}" CASCADE'))
+            print(f"  ✓ Dropped table {table.name}")
+        for enum_type in enum_types:
+            conn.execute(text(f'DROP TYPE IF EXISTS "{enum_type}" CASCADE'))
+            print(f"  ✓ Dropped type {enum_type}")
     
     print("✓ All tables dropped")
 
@@ -47,11 +69,6 @@ def create_all_tables():
     print("✓ All tables created")
 
 
-def hash_password(password):
-    """Hash a password using bcrypt."""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
-
 def seed_users():
     """Seed user data."""
     print("Seeding users...")
@@ -60,7 +77,7 @@ def seed_users():
         User(
             email='admin@mealplanner.com',
             username='admin',
-            password_hash=hash_password('admin123'),
+            password_hash=ADMIN_PASSWORD_HASH,
             full_name='Admin User',
             sex=SexEnum.OTHER.value,
             phone_number='555-0100',
@@ -68,13 +85,12 @@ def seed_users():
             city='San Francisco',
             state_province_code='CA',
             country_code='US',
-            postal_code='94102',
-            created_at=datetime.utcnow()
+            postal_code='94102'
         ),
         User(
             email='john.doe@example.com',
             username='johndoe',
-            password_hash=hash_password('password123'),
+            password_hash=USER_PASSWORD_HASH,
             full_name='John Doe',
             sex=SexEnum.MALE.value,
             phone_number='555-0101',
@@ -83,13 +99,12 @@ def seed_users():
             city='New York',
             state_province_code='NY',
             country_code='US',
-            postal_code='10001',
-            created_at=datetime.utcnow()
+            postal_code='10001'
         ),
         User(
             email='jane.smith@example.com',
             username='janesmith',
-            password_hash=hash_password('password123'),
+            password_hash=USER_PASSWORD_HASH,
             full_name='Jane Smith',
             sex=SexEnum.FEMALE.value,
             phone_number='555-0102',
@@ -97,15 +112,12 @@ def seed_users():
             city='Austin',
             state_province_code='TX',
             country_code='US',
-            postal_code='78701',
-            created_at=datetime.utcnow()
+            postal_code='78701'
         )
     ]
     
-    for user in users:
-        db.session.add(user)
-    
-    db.session.commit()
+    db.session.add_all(users)
+    db.session.flush()
     print(f"✓ Seeded {len(users)} users")
     return users
 
@@ -126,8 +138,7 @@ def seed_foods():
             fiber=0,
             serving_size='100',
             unit='grams',
-            non_inflammatory=True,
-            created_at=datetime.utcnow()
+            non_inflammatory=True
         ),
         Food(
             name='Lean Ground Beef',
@@ -139,8 +150,7 @@ def seed_foods():
             fiber=0,
             serving_size='100',
             unit='grams',
-            non_inflammatory=False,
-            created_at=datetime.utcnow()
+            non_inflammatory=False
         ),
         
         # FISH
@@ -154,8 +164,7 @@ def seed_foods():
             fiber=0,
             serving_size='100',
             unit='grams',
-            non_inflammatory=True,
-            created_at=datetime.utcnow()
+            non_inflammatory=True
         ),
         Food(
             name='Tuna Steak',
@@ -167,8 +176,7 @@ def seed_foods():
             fiber=0,
             serving_size='100',
             unit='grams',
-            non_inflammatory=True,
-            created_at=datetime.utcnow()
+            non_inflammatory=True
         ),
         
         # GRAINS
@@ -182,8 +190,7 @@ def seed_foods():
             fiber=1.8,
             serving_size='100',
             unit='grams',
-            non_inflammatory=True,
-            created_at=datetime.utcnow()
+            non_inflammatory=True
         ),
         Food(
             name='Quinoa',
@@ -195,8 +202,7 @@ def seed_foods():
             fiber=2.8,
             serving_size='100',
             unit='grams',
-            non_inflammatory=True,
-            created_at=datetime.utcnow()
+            non_inflammatory=True
         ),
         
         # VEGETABLES
@@ -210,8 +216,7 @@ def seed_foods():
             fiber=2.6,
             serving_size='100',
             unit='grams',
-            non_inflammatory=True,
-            created_at=datetime.utcnow()
+            non_inflammatory=True
         ),
         Food(
             name='Spinach',
@@ -223,8 +228,7 @@ def seed_foods():
             fiber=2.2,
             serving_size='100',
             unit='grams',
-            non_inflammatory=True,
-            created_at=datetime.utcnow()
+            non_inflammatory=True
         ),
         
         # NIGHTSHADES
@@ -238,8 +242,7 @@ def seed_foods():
             fiber=1.2,
             serving_size='100',
             unit='grams',
-            non_inflammatory=False,
-            created_at=datetime.utcnow()
+            non_inflammatory=False
         ),
         Food(
             name='Bell Pepper',
@@ -251,8 +254,7 @@ def seed_foods():
             fiber=2.1,
             serving_size='100',
             unit='grams',
-            non_inflammatory=False,
-            created_at=datetime.utcnow()
+            non_inflammatory=False
         ),
         
         # FRUITS
@@ -266,8 +268,7 @@ def seed_foods():
             fiber=2.4,
             serving_size='1 medium',
             unit='piece',
-            non_inflammatory=True,
-            created_at=datetime.utcnow()
+            non_inflammatory=True
         ),
         Food(
             name='Banana',
@@ -279,8 +280,7 @@ def seed_foods():
             fiber=2.6,
             serving_size='1 medium',
             unit='piece',
-            non_inflammatory=True,
-            created_at=datetime.utcnow()
+            non_inflammatory=True
         ),
         
         # DAIRY
@@ -294,8 +294,7 @@ def seed_foods():
             fiber=0,
             serving_size='100',
             unit='grams',
-            non_inflammatory=False,
-            created_at=datetime.utcnow()
+            non_inflammatory=False
         ),
         
         # OIL
@@ -309,8 +308,7 @@ def seed_foods():
             fiber=0,
             serving_size='100',
             unit='ml',
-            non_inflammatory=True,
-            created_at=datetime.utcnow()
+            non_inflammatory=True
         ),
         
         # SPICE_HERB
@@ -324,8 +322,7 @@ def seed_foods():
             fiber=22.7,
             serving_size='100',
             unit='grams',
-            non_inflammatory=True,
-            created_at=datetime.utcnow()
+            non_inflammatory=True
         ),
         
         # SWEETENER
@@ -339,15 +336,12 @@ def seed_foods():
             fiber=0.2,
             serving_size='100',
             unit='grams',
-            non_inflammatory=True,
-            created_at=datetime.utcnow()
+            non_inflammatory=True
         )
     ]
     
-    for food in foods:
-        db.session.add(food)
-    
-    db.session.commit()
+    db.session.add_all(foods)
+    db.session.flush()
     print(f"✓ Seeded {len(foods)} food items")
     return foods
 
@@ -365,8 +359,7 @@ def seed_meals(foods):
             total_protein=40,
             total_carbs=35,
             total_fat=8,
-            prep_time=25,
-            created_at=datetime.utcnow()
+            prep_time=25
         ),
         Meal(
             name='Salmon Power Plate',
@@ -375,8 +368,7 @@ def seed_meals(foods):
             total_protein=32,
             total_carbs=28,
             total_fat=15,
-            prep_time=30,
-            created_at=datetime.utcnow()
+            prep_time=30
         ),
         Meal(
             name='Morning Energy Bowl',
@@ -385,15 +377,12 @@ def seed_meals(foods):
             total_protein=12,
             total_carbs=45,
             total_fat=2,
-            prep_time=5,
-            created_at=datetime.utcnow()
+            prep_time=5
         )
     ]
     
-    for meal in meals:
-        db.session.add(meal)
-    
-    db.session.commit()
+    db.session.add_all(meals)
+    db.session.flush()
     print(f"✓ Seeded {len(meals)} meals")
     return meals
 
@@ -412,22 +401,19 @@ def seed_meal_ingredients(meals, foods):
             food_id=food_dict['Grilled Chicken Breast'].id,
             quantity=150,
             unit='grams',
-            notes='Seasoned with herbs',
-            created_at=datetime.utcnow()
+            notes='Seasoned with herbs'
         ),
         MealIngredients(
             meal_id=meals[0].id,
             food_id=food_dict['Brown Rice'].id,
             quantity=100,
-            unit='grams',
-            created_at=datetime.utcnow()
+            unit='grams'
         ),
         MealIngredients(
             meal_id=meals[0].id,
             food_id=food_dict['Broccoli'].id,
             quantity=100,
-            unit='grams',
-            created_at=datetime.utcnow()
+            unit='grams'
         ),
         
         # Salmon Power Plate
@@ -435,22 +421,19 @@ def seed_meal_ingredients(meals, foods):
             meal_id=meals[1].id,
             food_id=food_dict['Salmon Fillet'].id,
             quantity=120,
-            unit='grams',
-            created_at=datetime.utcnow()
+            unit='grams'
         ),
         MealIngredients(
             meal_id=meals[1].id,
             food_id=food_dict['Quinoa'].id,
             quantity=100,
-            unit='grams',
-            created_at=datetime.utcnow()
+            unit='grams'
         ),
         MealIngredients(
             meal_id=meals[1].id,
             food_id=food_dict['Spinach'].id,
             quantity=150,
-            unit='grams',
-            created_at=datetime.utcnow()
+            unit='grams'
         ),
         
         # Morning Energy Bowl
@@ -458,29 +441,24 @@ def seed_meal_ingredients(meals, foods):
             meal_id=meals[2].id,
             food_id=food_dict['Greek Yogurt'].id,
             quantity=200,
-            unit='grams',
-            created_at=datetime.utcnow()
+            unit='grams'
         ),
         MealIngredients(
             meal_id=meals[2].id,
             food_id=food_dict['Banana'].id,
             quantity=1,
-            unit='piece',
-            created_at=datetime.utcnow()
+            unit='piece'
         ),
         MealIngredients(
             meal_id=meals[2].id,
             food_id=food_dict['Honey'].id,
             quantity=20,
-            unit='grams',
-            created_at=datetime.utcnow()
+            unit='grams'
         )
     ]
     
-    for ingredient in ingredients:
-        db.session.add(ingredient)
-    
-    db.session.commit()
+    db.session.add_all(ingredients)
+    db.session.flush()
     print(f"✓ Seeded {len(ingredients)} meal ingredients")
 
 
@@ -495,54 +473,44 @@ def seed_user_favorites(users, foods):
         # Admin likes healthy options
         FoodUserLikes(
             user_id=users[0].id,
-            food_id=food_dict['Salmon Fillet'].id,
-            created_at=datetime.utcnow()
+            food_id=food_dict['Salmon Fillet'].id
         ),
         FoodUserLikes(
             user_id=users[0].id,
-            food_id=food_dict['Quinoa'].id,
-            created_at=datetime.utcnow()
+            food_id=food_dict['Quinoa'].id
         ),
         FoodUserLikes(
             user_id=users[0].id,
-            food_id=food_dict['Broccoli'].id,
-            created_at=datetime.utcnow()
+            food_id=food_dict['Broccoli'].id
         ),
         
         # John likes meat and grains
         FoodUserLikes(
             user_id=users[1].id,
-            food_id=food_dict['Grilled Chicken Breast'].id,
-            created_at=datetime.utcnow()
+            food_id=food_dict['Grilled Chicken Breast'].id
         ),
         FoodUserLikes(
             user_id=users[1].id,
-            food_id=food_dict['Brown Rice'].id,
-            created_at=datetime.utcnow()
+            food_id=food_dict['Brown Rice'].id
         ),
         
         # Jane likes fruits and dairy
         FoodUserLikes(
             user_id=users[2].id,
-            food_id=food_dict['Greek Yogurt'].id,
-            created_at=datetime.utcnow()
+            food_id=food_dict['Greek Yogurt'].id
         ),
         FoodUserLikes(
             user_id=users[2].id,
-            food_id=food_dict['Banana'].id,
-            created_at=datetime.utcnow()
+            food_id=food_dict['Banana'].id
         ),
         FoodUserLikes(
             user_id=users[2].id,
-            food_id=food_dict['Apple'].id,
-            created_at=datetime.utcnow()
+            food_id=food_dict['Apple'].id
         )
     ]
     
-    for favorite in favorites:
-        db.session.add(favorite)
-    
-    db.session.commit()
+    db.session.add_all(favorites)
+    db.session.flush()
     print(f"✓ Seeded {len(favorites)} user favorite foods")
 
 
@@ -558,22 +526,19 @@ def seed_user_meals(users, meals):
             user_id=users[0].id,
             meal_id=meals[0].id,  # Chicken Bowl
             date=today,
-            meal_number=2,  # Lunch
-            created_at=datetime.utcnow()
+            meal_number=2  # Lunch
         ),
         UserMeal(
             user_id=users[0].id,
             meal_id=meals[1].id,  # Salmon Plate
             date=today,
-            meal_number=3,  # Dinner
-            created_at=datetime.utcnow()
+            meal_number=3  # Dinner
         ),
         UserMeal(
             user_id=users[0].id,
             meal_id=meals[2].id,  # Energy Bowl
             date=today + timedelta(days=1),
-            meal_number=1,  # Breakfast
-            created_at=datetime.utcnow()
+            meal_number=1  # Breakfast
         ),
         
         # John's meals
@@ -581,15 +546,13 @@ def seed_user_meals(users, meals):
             user_id=users[1].id,
             meal_id=meals[0].id,  # Chicken Bowl
             date=today,
-            meal_number=2,  # Lunch
-            created_at=datetime.utcnow()
+            meal_number=2  # Lunch
         ),
         UserMeal(
             user_id=users[1].id,
             meal_id=meals[0].id,  # Chicken Bowl again
             date=today + timedelta(days=1),
-            meal_number=3,  # Dinner
-            created_at=datetime.utcnow()
+            meal_number=3  # Dinner
         ),
         
         # Jane's meals
@@ -597,54 +560,51 @@ def seed_user_meals(users, meals):
             user_id=users[2].id,
             meal_id=meals[2].id,  # Energy Bowl
             date=today,
-            meal_number=1,  # Breakfast
-            created_at=datetime.utcnow()
+            meal_number=1  # Breakfast
         ),
         UserMeal(
             user_id=users[2].id,
             meal_id=meals[1].id,  # Salmon Plate
             date=today,
-            meal_number=3,  # Dinner
-            created_at=datetime.utcnow()
+            meal_number=3  # Dinner
         )
     ]
     
-    for user_meal in user_meals:
-        db.session.add(user_meal)
-    
-    db.session.commit()
+    db.session.add_all(user_meals)
+    db.session.flush()
     print(f"✓ Seeded {len(user_meals)} user meals")
 
 
-def rebuild_database(target=None):
+def rebuild_database(target=None, force=False):
     """Main function to rebuild the database.
     
     Args:
         target: Database target ('local', 'cloud', or None for default)
+        force: Drop the entire public schema instead of only the model tables
     """
     print("\n" + "="*50)
     print("DATABASE REBUILD SCRIPT")
     print("="*50 + "\n")
     
     # If target specified, import and use test database configuration
+    overrides = {}
     if target in ['local', 'cloud']:
         from tests.db_config import TestDatabaseConfig
         database_url = TestDatabaseConfig.get_database_url(target)
-        os.environ['DATABASE_URL'] = database_url
+        # Config values are read once at import, so pass the URL to the app directly
+        overrides['SQLALCHEMY_DATABASE_URI'] = database_url
         print(f"Using {target} database: {TestDatabaseConfig.get_config(target).description}")
         db_info = f"Database: {target} test database"
     else:
         db_info = "Database: development database (port 5455)"
     
-    # Import app modules after setting DATABASE_URL
     from app import create_app
     from app.models.database import db
     from app.models.entities import (
         User, Food, Meal, FoodUserLikes, UserMeal, MealIngredients,
         SexEnum, FoodCategoryEnum
     )
-    import bcrypt
-    from sqlalchemy import text
+    from sqlalchemy import Enum, text
     
     # Make these available globally for the seed functions
     globals()['db'] = db
@@ -656,15 +616,15 @@ def rebuild_database(target=None):
     globals()['MealIngredients'] = MealIngredients
     globals()['SexEnum'] = SexEnum
     globals()['FoodCategoryEnum'] = FoodCategoryEnum
-    globals()['bcrypt'] = bcrypt
     globals()['text'] = text
+    globals()['Enum'] = Enum
     
-    app = create_app('development')
+    app = create_app('development', overrides=overrides)
     
     with app.app_context():
         try:
             # Drop all tables (CASCADE handles foreign keys)
-            drop_all_tables()
+            drop_all_tables(force=force)
             
             # Create all tables
             create_all_tables()
@@ -677,6 +637,10 @@ def rebuild_database(target=None):
             seed_user_favorites(users, foods)
             seed_user_meals(users, meals)
             
+            # Seed functions only flush (one batched INSERT ... RETURNING per
+            # table); commit everything in a single transaction
+            db.session.commit()
+            
             print("\n" + "="*50)
             print("✓ DATABASE REBUILD COMPLETE!")
             print("="*50)
@@ -705,6 +669,7 @@ Examples:
   python scripts/rebuild_db.py           # Use default development database
   python scripts/rebuild_db.py --local   # Use local test database
   python scripts/rebuild_db.py --cloud   # Use cloud test database
+  python scripts/rebuild_db.py --force   # Drop the whole public schema first
         """
     )
     
@@ -720,6 +685,11 @@ Examples:
         action='store_true',
         help='Use cloud test database'
     )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Drop and recreate the whole public schema (removes non-model objects too)'
+    )
     
     args = parser.parse_args()
     
@@ -730,7 +700,7 @@ Examples:
     elif args.cloud:
         target = 'cloud'
     
-    rebuild_database(target)
+    rebuild_database(target, force=args.force)
 
 
 if __name__ == '__main__':
@@ -8,17 +8,64 @@ and code for known vulnerabilities and security issues.
 Usage:
     python scripts/security_audit.py              # Run all security checks
     python scripts/security_audit.py --quick      # Quick scan (pip-audit only) - fastest
-    python scripts/security_audit.py --deps       # Full dependency scan (pip-audit + Safety + outdated)
+    python scripts/security_audit.py --deps       # Dependency scan (pip-audit + outdated)
+    python scripts/security_audit.py --deep       # Also run Safety (slower, overlaps pip-audit)
     python scripts/security_audit.py --code       # Only scan code with Ruff
+    python scripts/security_audit.py --max-cache-age 0  # Ignore cached scan results
+    python scripts/security_audit.py --refresh-tools    # Rebuild the audit tools venv
+    python scripts/security_audit.py --json-out audit.json  # Also write a machine-readable report
 """
 
 import sys
 import subprocess
 import json
 import argparse
+import hashlib
+import importlib.metadata
+import os
+import shutil
+import threading
+import time
+import urllib.parse
+import urllib.request
+import venv
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Tuple
+from datetime import UTC, datetime
+from typing import Dict, List, Optional, Tuple
+
+try:
+    # orjson (already an app dependency) parses the tool reports much faster;
+    # its JSONDecodeError subclasses json.JSONDecodeError
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    from packaging.version import InvalidVersion, Version
+except ImportError:  # packaging ships inside pip when not installed on its own
+    from pip._vendor.packaging.version import InvalidVersion, Version
+
+# Scan results are cached here, keyed by a hash of requirements.txt (pip-audit)
+# or of requirements.txt plus the installed packages (Safety, outdated check)
+AUDIT_CACHE_DIR = Path.home() / '.cache' / 'meal-planner-audit'
+RESULTS_CACHE_FILE = AUDIT_CACHE_DIR / 'results.json'
+DEFAULT_MAX_CACHE_AGE_HOURS = 24
+PIP_AUDIT_CACHE_DIR = AUDIT_CACHE_DIR / 'pip-audit'  # pip-audit's own HTTP/advisory cache
+RUFF_CACHE_DIR = AUDIT_CACHE_DIR / 'ruff'  # Ruff's per-file lint cache
+
+# Version of the --json-out report layout; bump on incompatible changes
+JSON_REPORT_SCHEMA = 1
+
+# Tools the script installs itself live in their own venv, not the app's
+TOOLS_VENV_DIR = AUDIT_CACHE_DIR / 'venv'
+TOOLS_BIN_DIR = TOOLS_VENV_DIR / ('Scripts' if os.name == 'nt' else 'bin')
+
+# Latest releases are looked up concurrently from PyPI's JSON API
+PYPI_JSON_URL = 'https://pypi.org/pypi/{name}/json'
+PYPI_MAX_CONNECTIONS = 20
+PYPI_TIMEOUT = 10  # seconds
 
 
 class Colors:
@@ -29,344 +76,601 @@ class Colors:
     BLUE = '\033[94m'
     RESET = '\033[0m'
     BOLD = '\033[1m'
+    
+    @classmethod
+    def disable(cls) -> None:
+        """Drop all escape codes (for output redirected to a file or pipe)."""
+        cls.RED = cls.GREEN = cls.YELLOW = cls.BLUE = cls.RESET = cls.BOLD = ''
 
 
 class SecurityAuditor:
     """Performs security audits on Python projects."""
     
-    def __init__(self, project_root: Path):
+    def __init__(self, project_root: Path, max_cache_age_hours: float = DEFAULT_MAX_CACHE_AGE_HOURS,
+                 refresh_tools: bool = False):
         self.project_root = project_root
         self.backend_dir = project_root / 'backend'
         self.requirements_file = self.backend_dir / 'requirements.txt'
-        self.vulnerabilities_found = False
         
-    def check_tool_installed(self, tool: str) -> bool:
-        """Check if a security tool is installed."""
+        # Read requirements.txt once; every check reuses the bytes and their hash
         try:
-            result = subprocess.run(
-                [tool, '--version'],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            return result.returncode == 0
+            self._requirements_bytes = self.requirements_file.read_bytes()
         except FileNotFoundError:
-            return False
+            self._requirements_bytes = None
+        self._requirements_hash = (
+            hashlib.sha256(self._requirements_bytes).hexdigest()
+            if self._requirements_bytes is not None else None
+        )
+        self.vulnerabilities_found = False
+        self.max_cache_age = max_cache_age_hours * 3600  # seconds; 0 disables the cache
+        self.refresh_tools = refresh_tools
+        self._local = threading.local()
+        self._tool_checks = {}
+        self._installed = None
+        self._direct_installs = set()
+        self._fingerprint = None
+        self._cache_lock = threading.Lock()
+    
+    def _print(self, text: str = '') -> None:
+        """Print a line, or buffer it when called from a concurrent check."""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            print(text)
+        else:
+            buffer.append(f"{text}\n")
+    
+    def _run_buffered(self, check):
+        """Run a check with its output captured, so concurrent checks don't interleave."""
+        self._local.buffer = []
+        try:
+            return check(), ''.join(self._local.buffer)
+        finally:
+            self._local.buffer = None
+    
+    def _run_and_write(self, check):
+        """Run a check in this thread and write its output with a single write()."""
+        result, output = self._run_buffered(check)
+        sys.stdout.write(output)
+        sys.stdout.flush()
+        return result
+    
+    def _installed_packages(self) -> Dict[str, Tuple[str, str]]:
+        """Installed distributions of this interpreter, like 'pip list' (read once)."""
+        if self._installed is None:
+            installed = {}
+            for dist in importlib.metadata.distributions():
+                name = dist.metadata['Name']
+                if name:
+                    installed.setdefault(name.lower(), (name, dist.version))
+                    # Editable, local-path and VCS installs record where they came from
+                    if dist.read_text('direct_url.json') is not None:
+                        self._direct_installs.add(name.lower())
+            self._installed = installed
+        return self._installed
+    
+    def _environment_fingerprint(self) -> str:
+        """Hash of requirements.txt plus the installed package set."""
+        if self._fingerprint is None:
+            packages = '\n'.join(
+                f"{name}=={version}" for name, version in sorted(self._installed_packages().values())
+            )
+            self._fingerprint = hashlib.blake2b(
+                (self._requirements_bytes or b'') + b'|' + packages.encode('utf-8')
+            ).hexdigest()
+        return self._fingerprint
+    
+    def _load_cache(self) -> Dict:
+        """Load cached results from disk (empty if missing or unreadable)."""
+        try:
+            return json_loads(RESULTS_CACHE_FILE.read_bytes())
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_cache(self, cache: Dict) -> None:
+        """Write cached results to disk; caching is best effort."""
+        try:
+            AUDIT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            RESULTS_CACHE_FILE.write_text(json.dumps(cache))
+        except OSError:
+            pass
+    
+    def _get_cached(self, check: str, key: Optional[str]):
+        """Return a check's cached result if it matches key and is fresh enough."""
+        if key is None or self.max_cache_age <= 0:
+            return None
+        
+        with self._cache_lock:
+            entry = self._load_cache().get(check)
+        
+        if not entry or entry.get('key') != key:
+            return None
+        if time.time() - entry.get('timestamp', 0) > self.max_cache_age:
+            return None
+        return entry['result']
+    
+    def _set_cached(self, check: str, key: Optional[str], result) -> None:
+        """Store a check's result under key, replacing any older entry."""
+        if key is None:
+            return
+        
+        with self._cache_lock:
+            cache = self._load_cache()
+            cache[check] = {'key': key, 'timestamp': time.time(), 'result': result}
+            self._save_cache(cache)
+        
+    def _tool_command(self, tool: str) -> str:
+        """Absolute path of a tool (audit tools venv first, then PATH), or its bare name."""
+        venv_tool = TOOLS_BIN_DIR / tool
+        if venv_tool.exists():
+            return str(venv_tool)
+        return shutil.which(tool) or tool
+    
+    def _tool_stamp(self, tool: str) -> str:
+        """Cheap version stamp for a tool: its executable's mtime (changes on upgrade)."""
+        path = shutil.which(self._tool_command(tool))
+        try:
+            return str(os.stat(path).st_mtime_ns) if path else 'missing'
+        except OSError:
+            return 'missing'
+    
+    def check_tool_installed(self, tool: str) -> bool:
+        """Check if a security tool is installed (a PATH lookup, no process spawned)."""
+        if tool not in self._tool_checks:
+            # A broken install still surfaces through the tool's own exit status
+            self._tool_checks[tool] = shutil.which(self._tool_command(tool)) is not None
+        return self._tool_checks[tool]
     
     def ensure_pip_audit(self) -> bool:
-        """Ensure pip-audit is installed."""
-        if not self.check_tool_installed('pip-audit'):
-            print(f"{Colors.YELLOW}📦 Installing pip-audit...{Colors.RESET}")
+        """Ensure pip-audit is installed (into the audit tools venv if missing)."""
+        if self.refresh_tools or not self.check_tool_installed('pip-audit'):
+            self._print(f"{Colors.YELLOW}📦 Installing pip-audit into {TOOLS_VENV_DIR}...{Colors.RESET}")
             try:
+                if self.refresh_tools:
+                    shutil.rmtree(TOOLS_VENV_DIR, ignore_errors=True)
+                venv.create(TOOLS_VENV_DIR, with_pip=True)
                 subprocess.run(
-                    [sys.executable, '-m', 'pip', 'install', 'pip-audit'],
+                    [str(TOOLS_BIN_DIR / 'python'), '-m', 'pip', 'install', '--quiet', 'pip-audit'],
                     check=True,
                     capture_output=True
                 )
-                print(f"{Colors.GREEN}✅ pip-audit installed{Colors.RESET}")
+                self._print(f"{Colors.GREEN}✅ pip-audit installed{Colors.RESET}")
+                self.refresh_tools = False
+                self._tool_checks['pip-audit'] = True
                 return True
-            except subprocess.CalledProcessError:
-                print(f"{Colors.RED}❌ Failed to install pip-audit{Colors.RESET}")
+            except (OSError, subprocess.CalledProcessError):
+                self._print(f"{Colors.RED}❌ Failed to install pip-audit{Colors.RESET}")
                 return False
         return True
     
-    def run_pip_audit(self) -> Tuple[bool, List[Dict]]:
-        """Run pip-audit to check for vulnerable dependencies."""
+    def run_pip_audit(self) -> Tuple[bool, List[Dict], int]:
+        """Run pip-audit to check for vulnerable dependencies.
+        
+        Returns:
+            Tuple of (has_vulns, vulnerable packages, total vulnerability count)
+        """
+        # Reuse a recent scan of the same requirements.txt by the same pip-audit
+        cache_key = (
+            f"{self._requirements_hash}:{self._tool_stamp('pip-audit')}"
+            if self._requirements_hash else None
+        )
+        cached = self._get_cached('pip_audit', cache_key)
+        if cached is not None:
+            self._print(f"\n{Colors.BLUE}🔍 Using cached pip-audit results (requirements.txt unchanged)...{Colors.RESET}")
+            return self._report_pip_audit(cached)
+        
         if not self.ensure_pip_audit():
-            return False, []
+            return False, [], 0
             
-        print(f"\n{Colors.BLUE}🔍 Running pip-audit vulnerability scan...{Colors.RESET}")
+        self._print(f"\n{Colors.BLUE}🔍 Running pip-audit vulnerability scan...{Colors.RESET}")
         
-        cmd = ['pip-audit']
+        cmd = [self._tool_command('pip-audit')]
         
         # Add requirements file if it exists
-        if self.requirements_file.exists():
+        if self._requirements_bytes is not None:
             cmd.extend(['-r', str(self.requirements_file)])
         
         # Add JSON output for parsing
         cmd.extend(['--format', 'json'])
         
+        # Keep pip-audit's downloads in a stable, CI-cacheable location
+        cmd.extend(['--cache-dir', str(PIP_AUDIT_CACHE_DIR)])
+        
         try:
             result = subprocess.run(
                 cmd,
-                capture_output=True,
-                text=True,
+                capture_output=True,  # bytes: json_loads parses them without a decode pass
                 check=False,
-                cwd=str(self.backend_dir)
+                # An absolute executable, no cwd and close_fds=False let CPython
+                # launch via posix_spawn instead of fork+exec; Python's own fds
+                # are non-inheritable, so nothing leaks into the child
+                close_fds=False,
+                # Without -r, audit this interpreter's packages, not the tools venv
+                env={**os.environ, 'PIPAPI_PYTHON_LOCATION': sys.executable}
             )
             
             # Parse JSON output
             vulnerabilities = []
             if result.stdout:
                 try:
-                    data = json.loads(result.stdout)
+                    data = json_loads(result.stdout)
                     # pip-audit returns data in {"dependencies": [...], "fixes": []}
                     if isinstance(data, dict) and 'dependencies' in data:
                         # Filter only packages with vulnerabilities
                         for dep in data['dependencies']:
                             if dep.get('vulns'):
                                 vulnerabilities.append(dep)
+                        self._set_cached('pip_audit', cache_key, vulnerabilities)
                 except json.JSONDecodeError:
                     pass
             
-            if not vulnerabilities:
-                print(f"{Colors.GREEN}  ✅ No vulnerabilities found with pip-audit{Colors.RESET}")
-                return False, []
-            else:
-                # Count total vulnerabilities
-                total_vulns = sum(len(pkg.get('vulns', [])) for pkg in vulnerabilities)
-                print(f"{Colors.RED}  ⚠️  Found {total_vulns} vulnerabilities in {len(vulnerabilities)} packages{Colors.RESET}")
-                
-                for vuln in vulnerabilities:
-                    print(f"\n  {Colors.YELLOW}Package:{Colors.RESET} {vuln['name']} {vuln['version']}")
-                    for v in vuln.get('vulns', []):
-                        print(f"    {Colors.RED}ID:{Colors.RESET} {v['id']}")
-                        if 'aliases' in v and v['aliases']:
-                            print(f"    {Colors.YELLOW}CVE:{Colors.RESET} {', '.join(v['aliases'])}")
-                        desc = v.get('description', 'No description')[:150]
-                        print(f"    {Colors.RESET}Description: {desc}...")
-                        if 'fix_versions' in v and v['fix_versions']:
-                            fix_ver = v['fix_versions'][0] if v['fix_versions'] else 'Unknown'
-                            print(f"    {Colors.GREEN}Fix:{Colors.RESET} Update to {fix_ver} in requirements.txt")
-                
-                return True, vulnerabilities
+            return self._report_pip_audit(vulnerabilities)
                 
         except Exception as e:
-            print(f"{Colors.RED}  ❌ Error running pip-audit: {e}{Colors.RESET}")
-            return False, []
+            self._print(f"{Colors.RED}  ❌ Error running pip-audit: {e}{Colors.RESET}")
+            return False, [], 0
+    
+    def _report_pip_audit(self, vulnerabilities: List[Dict]) -> Tuple[bool, List[Dict], int]:
+        """Print pip-audit findings."""
+        if not vulnerabilities:
+            self._print(f"{Colors.GREEN}  ✅ No vulnerabilities found with pip-audit{Colors.RESET}")
+            return False, [], 0
+        else:
+            # Count total vulnerabilities
+            total_vulns = sum(len(pkg.get('vulns', ())) for pkg in vulnerabilities)
+            self._print(f"{Colors.RED}  ⚠️  Found {total_vulns} vulnerabilities in {len(vulnerabilities)} packages{Colors.RESET}")
+            
+            for vuln in vulnerabilities:
+                self._print(f"\n  {Colors.YELLOW}Package:{Colors.RESET} {vuln['name']} {vuln['version']}")
+                for v in vuln.get('vulns', []):
+                    self._print(f"    {Colors.RED}ID:{Colors.RESET} {v['id']}")
+                    if 'aliases' in v and v['aliases']:
+                        self._print(f"    {Colors.YELLOW}CVE:{Colors.RESET} {', '.join(v['aliases'])}")
+                    desc = v.get('description', 'No description')[:150]
+                    self._print(f"    {Colors.RESET}Description: {desc}...")
+                    if 'fix_versions' in v and v['fix_versions']:
+                        fix_ver = v['fix_versions'][0] if v['fix_versions'] else 'Unknown'
+                        self._print(f"    {Colors.GREEN}Fix:{Colors.RESET} Update to {fix_ver} in requirements.txt")
+            
+            return True, vulnerabilities, total_vulns
     
     def run_safety_check(self) -> Tuple[bool, List[Dict]]:
         """Run safety check for additional vulnerability scanning."""
+        # Reuse a recent scan if neither requirements, installed packages nor Safety changed
+        fingerprint = f"{self._environment_fingerprint()}:{self._tool_stamp('safety')}"
+        cached = self._get_cached('safety', fingerprint)
+        if cached is not None:
+            self._print(f"\n{Colors.BLUE}🔍 Using cached Safety results (environment unchanged)...{Colors.RESET}")
+            return self._report_safety(cached)
+        
         if not self.check_tool_installed('safety'):
-            print(f"\n{Colors.YELLOW}⏭️  Safety not installed. Install with: pip install safety{Colors.RESET}")
-            print(f"{Colors.BLUE}    Safety provides additional CVE checking from pyup.io database{Colors.RESET}")
+            self._print(f"\n{Colors.YELLOW}⏭️  Safety not installed. Install with: pip install safety{Colors.RESET}")
+            self._print(f"{Colors.BLUE}    Safety provides additional CVE checking from pyup.io database{Colors.RESET}")
             return False, []
         
-        print(f"\n{Colors.BLUE}🔍 Running Safety vulnerability scan...{Colors.RESET}")
+        self._print(f"\n{Colors.BLUE}🔍 Running Safety vulnerability scan...{Colors.RESET}")
         
-        cmd = ['safety', 'check', '--json']
+        cmd = [self._tool_command('safety'), 'check', '--json']
         
-        if self.requirements_file.exists():
+        if self._requirements_bytes is not None:
             cmd.extend(['-r', str(self.requirements_file)])
         
         try:
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
                 check=False,
-                cwd=str(self.backend_dir)
+                close_fds=False  # posix_spawn, as for pip-audit
             )
             
             if result.returncode == 0:
-                print(f"{Colors.GREEN}  ✅ No vulnerabilities found with Safety{Colors.RESET}")
-                return False, []
+                vulnerabilities = []
             else:
                 # Safety returns JSON even on failure
                 try:
-                    report = json.loads(result.stdout)
-                    vulnerabilities = report.get('vulnerabilities', [])
-                    vuln_count = len(vulnerabilities)
-                    
-                    if vuln_count > 0:
-                        print(f"{Colors.RED}  ⚠️  Found {vuln_count} vulnerabilities with Safety{Colors.RESET}")
-                        
-                        for vuln in vulnerabilities[:5]:  # Show first 5
-                            print(f"\n  {Colors.YELLOW}Package:{Colors.RESET} {vuln['package_name']} {vuln['analyzed_version']}")
-                            print(f"    {Colors.RED}CVE:{Colors.RESET} {vuln.get('cve', vuln.get('vulnerability_id', 'Unknown'))}")
-                            severity = vuln.get('severity', 'Unknown')
-                            color = Colors.RED if severity == 'high' else Colors.YELLOW
-                            print(f"    {color}Severity:{Colors.RESET} {severity}")
-                            print(f"    Advisory: {vuln['advisory'][:100]}...")
-                        
-                        if vuln_count > 5:
-                            print(f"\n  ... and {vuln_count - 5} more vulnerabilities")
-                        
-                        return True, vulnerabilities
+                    report = json_loads(result.stdout)
                 except json.JSONDecodeError:
-                    pass
-                    
-                return False, []
+                    return False, []
+                vulnerabilities = report.get('vulnerabilities', [])
+                if not vulnerabilities:
+                    return False, []  # Failed for another reason; nothing to cache
+            
+            self._set_cached('safety', fingerprint, vulnerabilities)
+            return self._report_safety(vulnerabilities)
                 
         except Exception as e:
-            print(f"{Colors.RED}  ❌ Error running Safety: {e}{Colors.RESET}")
+            self._print(f"{Colors.RED}  ❌ Error running Safety: {e}{Colors.RESET}")
             return False, []
     
+    def _report_safety(self, vulnerabilities: List[Dict]) -> Tuple[bool, List[Dict]]:
+        """Print Safety findings."""
+        vuln_count = len(vulnerabilities)
+        
+        if vuln_count == 0:
+            self._print(f"{Colors.GREEN}  ✅ No vulnerabilities found with Safety{Colors.RESET}")
+            return False, []
+        
+        self._print(f"{Colors.RED}  ⚠️  Found {vuln_count} vulnerabilities with Safety{Colors.RESET}")
+        
+        for vuln in vulnerabilities[:5]:  # Show first 5
+            self._print(f"\n  {Colors.YELLOW}Package:{Colors.RESET} {vuln['package_name']} {vuln['analyzed_version']}")
+            self._print(f"    {Colors.RED}CVE:{Colors.RESET} {vuln.get('cve', vuln.get('vulnerability_id', 'Unknown'))}")
+            severity = vuln.get('severity', 'Unknown')
+            color = Colors.RED if severity == 'high' else Colors.YELLOW
+            self._print(f"    {color}Severity:{Colors.RESET} {severity}")
+            self._print(f"    Advisory: {vuln['advisory'][:100]}...")
+        
+        if vuln_count > 5:
+            self._print(f"\n  ... and {vuln_count - 5} more vulnerabilities")
+        
+        return True, vulnerabilities
+    
     def run_code_security(self) -> Tuple[bool, Dict]:
         """Run Ruff for security and code quality analysis."""
         if not self.check_tool_installed('ruff'):
-            print(f"\n{Colors.YELLOW}⏭️  Ruff not installed{Colors.RESET}")
-            print(f"{Colors.BLUE}    Install with: {Colors.GREEN}pip install ruff{Colors.RESET}")
-            print(f"{Colors.BLUE}    Ruff provides fast security scanning and code quality checks{Colors.RESET}")
+            self._print(f"\n{Colors.YELLOW}⏭️  Ruff not installed{Colors.RESET}")
+            self._print(f"{Colors.BLUE}    Install with: {Colors.GREEN}pip install ruff{Colors.RESET}")
+            self._print(f"{Colors.BLUE}    Ruff provides fast security scanning and code quality checks{Colors.RESET}")
             return False, {}
     
         # Run Ruff with security rules
-        print(f"\n{Colors.BLUE}🔍 Running Ruff security analysis...{Colors.RESET}")
+        self._print(f"\n{Colors.BLUE}🔍 Running Ruff security analysis...{Colors.RESET}")
         
         app_dir = self.backend_dir / 'app'
         if not app_dir.exists():
-            print(f"{Colors.YELLOW}  ⏭️  No app directory found, skipping...{Colors.RESET}")
+            self._print(f"{Colors.YELLOW}  ⏭️  No app directory found, skipping...{Colors.RESET}")
             return False, {}
         
         # Run ruff with security rules (S prefix)
-        cmd = ['ruff', 'check', str(app_dir), '--select', 'S', '--output-format', 'json']
+        cmd = [self._tool_command('ruff'), 'check', str(app_dir), '--select', 'S', '--output-format', 'json']
+        
+        # Stable cache location, so unchanged files are skipped on the next audit
+        cmd.extend(['--cache-dir', str(RUFF_CACHE_DIR)])
         
         try:
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
-                check=False
+                check=False,
+                close_fds=False  # posix_spawn, as for pip-audit
             )
             
             if result.stdout:
-                issues = json.loads(result.stdout)
+                issues = json_loads(result.stdout)
             else:
                 issues = []
             
             if not issues:
-                print(f"{Colors.GREEN}  ✅ No security issues found with Ruff{Colors.RESET}")
+                self._print(f"{Colors.GREEN}  ✅ No security issues found with Ruff{Colors.RESET}")
                 return False, {'results': []}
             else:
-                print(f"{Colors.RED}  ⚠️  Found {len(issues)} security issues with Ruff{Colors.RESET}")
+                self._print(f"{Colors.RED}  ⚠️  Found {len(issues)} security issues with Ruff{Colors.RESET}")
                 
                 # Group by rule code
-                by_rule = {}
+                by_rule = defaultdict(list)
                 for issue in issues:
-                    rule = issue.get('code', 'Unknown')
-                    if rule not in by_rule:
-                        by_rule[rule] = []
-                    by_rule[rule].append(issue)
+                    by_rule[issue.get('code', 'Unknown')].append(issue)
                 
                 for rule, rule_issues in list(by_rule.items())[:5]:  # Show first 5 rule types
-                    print(f"\n  {Colors.YELLOW}Rule {rule}: {len(rule_issues)} issues{Colors.RESET}")
+                    self._print(f"\n  {Colors.YELLOW}Rule {rule}: {len(rule_issues)} issues{Colors.RESET}")
                     for issue in rule_issues[:2]:  # Show first 2 of each type
                         msg = issue.get('message', 'No message')
-                        file = Path(issue.get('filename', 'unknown')).name
+                        file = os.path.basename(issue.get('filename', 'unknown'))
                         line = issue.get('location', {}).get('row', '?')
-                        print(f"    • {msg}")
-                        print(f"      {Colors.BLUE}File:{Colors.RESET} {file}:{line}")
+                        self._print(f"    • {msg}")
+                        self._print(f"      {Colors.BLUE}File:{Colors.RESET} {file}:{line}")
                 
                 return True, {'results': issues}
                 
         except Exception as e:
-            print(f"{Colors.RED}  ❌ Error running Ruff: {e}{Colors.RESET}")
+            self._print(f"{Colors.RED}  ❌ Error running Ruff: {e}{Colors.RESET}")
             return False, {}
     
+    @staticmethod
+    def _latest_version(name: str) -> Optional[str]:
+        """Get the latest release of a package from PyPI (None if unavailable)."""
+        url = PYPI_JSON_URL.format(name=urllib.parse.quote(name))
+        if not url.startswith('https://'):
+            raise ValueError(f"Refusing non-HTTPS PyPI URL: {url}")
+        try:
+            # Fixed https:// PyPI endpoint (checked above); only the quoted name varies
+            with urllib.request.urlopen(url, timeout=PYPI_TIMEOUT) as response:  # noqa: S310
+                return json_loads(response.read())['info']['version']
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    @staticmethod
+    def _is_newer(latest: str, installed: str) -> bool:
+        """Compare two version strings, treating unparseable ones as not newer."""
+        try:
+            return Version(latest) > Version(installed)
+        except InvalidVersion:
+            return False
+    
     def check_outdated_packages(self) -> List[Dict]:
         """Check for outdated packages that might have security updates."""
-        print(f"\n{Colors.BLUE}📦 Checking for outdated packages...{Colors.RESET}")
+        # Reuse a recent check if neither requirements nor installed packages changed
+        fingerprint = self._environment_fingerprint()
+        cached = self._get_cached('outdated', fingerprint)
+        if cached is not None:
+            self._print(f"\n{Colors.BLUE}📦 Using cached outdated package check (environment unchanged)...{Colors.RESET}")
+            return self._report_outdated(cached)
         
-        cmd = [sys.executable, '-m', 'pip', 'list', '--outdated', '--format=json']
+        self._print(f"\n{Colors.BLUE}📦 Checking for outdated packages...{Colors.RESET}")
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            # Packages not installed from an index have no meaningful PyPI version
+            installed = {
+                key: value for key, value in self._installed_packages().items()
+                if key not in self._direct_installs
+            }
             
-            outdated = json.loads(result.stdout)
+            # One PyPI request per package, overlapped instead of sequential
+            with ThreadPoolExecutor(max_workers=PYPI_MAX_CONNECTIONS) as executor:
+                latest = dict(zip(installed, executor.map(self._latest_version, installed), strict=True))
             
-            if not outdated:
-                print(f"{Colors.GREEN}  ✅ All packages are up to date{Colors.RESET}")
-                return []
-            else:
-                print(f"{Colors.YELLOW}  📋 Found {len(outdated)} outdated packages:{Colors.RESET}")
-                for pkg in outdated[:10]:  # Show first 10
-                    print(f"    • {pkg['name']}: {pkg['version']} → {pkg['latest_version']}")
-                
-                if len(outdated) > 10:
-                    print(f"    ... and {len(outdated) - 10} more")
-                
-                return outdated
+            outdated = [
+                {'name': name, 'version': version, 'latest_version': latest[key]}
+                for key, (name, version) in sorted(installed.items())
+                if latest[key] and self._is_newer(latest[key], version)
+            ]
+            
+            self._set_cached('outdated', fingerprint, outdated)
+            return self._report_outdated(outdated)
                 
         except Exception as e:
-            print(f"{Colors.RED}  ❌ Error checking outdated packages: {e}{Colors.RESET}")
+            self._print(f"{Colors.RED}  ❌ Error checking outdated packages: {e}{Colors.RESET}")
+            return []
+    
+    def _report_outdated(self, outdated: List[Dict]) -> List[Dict]:
+        """Print outdated packages."""
+        if not outdated:
+            self._print(f"{Colors.GREEN}  ✅ All packages are up to date{Colors.RESET}")
             return []
+        
+        self._print(f"{Colors.YELLOW}  📋 Found {len(outdated)} outdated packages:{Colors.RESET}")
+        for pkg in outdated[:10]:  # Show first 10
+            self._print(f"    • {pkg['name']}: {pkg['version']} → {pkg['latest_version']}")
+        
+        if len(outdated) > 10:
+            self._print(f"    ... and {len(outdated) - 10} more")
+        
+        return outdated
     
-    def print_summary(self, pip_vulns: int, safety_vulns: int, ruff_issues: int, outdated: int):
+    def print_summary(self, pip_vulns: int, safety_vulns: int, ruff_issues: int, outdated: int,
+                      safety_skipped: bool = False):
         """Print a summary of the security audit."""
-        print(f"\n{'=' * 60}")
-        print(f"{Colors.BOLD}📊 SECURITY AUDIT SUMMARY{Colors.RESET}")
-        print(f"{'=' * 60}")
+        self._print(f"\n{'=' * 60}")
+        self._print(f"{Colors.BOLD}📊 SECURITY AUDIT SUMMARY{Colors.RESET}")
+        self._print(f"{'=' * 60}")
         
         total_issues = pip_vulns + safety_vulns + ruff_issues
         
         if total_issues == 0:
-            print(f"{Colors.GREEN}✅ No security issues found!{Colors.RESET}")
+            self._print(f"{Colors.GREEN}✅ No security issues found!{Colors.RESET}")
         else:
-            print(f"{Colors.RED}⚠️  Found {total_issues} total security issues{Colors.RESET}")
+            self._print(f"{Colors.RED}⚠️  Found {total_issues} total security issues{Colors.RESET}")
             
         if pip_vulns > 0:
-            print(f"  {Colors.RED}• Dependency vulnerabilities (pip-audit): {pip_vulns}{Colors.RESET}")
+            self._print(f"  {Colors.RED}• Dependency vulnerabilities (pip-audit): {pip_vulns}{Colors.RESET}")
         if safety_vulns > 0:
-            print(f"  {Colors.RED}• Dependency vulnerabilities (Safety): {safety_vulns}{Colors.RESET}")
+            self._print(f"  {Colors.RED}• Dependency vulnerabilities (Safety): {safety_vulns}{Colors.RESET}")
         if ruff_issues > 0:
-            print(f"  {Colors.YELLOW}• Code security issues (Ruff): {ruff_issues}{Colors.RESET}")
+            self._print(f"  {Colors.YELLOW}• Code security issues (Ruff): {ruff_issues}{Colors.RESET}")
         if outdated > 0:
-            print(f"  {Colors.BLUE}• Outdated packages: {outdated}{Colors.RESET}")
+            self._print(f"  {Colors.BLUE}• Outdated packages: {outdated}{Colors.RESET}")
+        if safety_skipped:
+            self._print(f"  {Colors.BLUE}• Safety skipped (use --deep){Colors.RESET}")
         
-        print(f"{'=' * 60}\n")
+        self._print(f"{'=' * 60}\n")
         
         # Recommendations
         if total_issues > 0:
-            print(f"{Colors.BOLD}📋 Recommendations:{Colors.RESET}")
+            self._print(f"{Colors.BOLD}📋 Recommendations:{Colors.RESET}")
             if pip_vulns > 0 or safety_vulns > 0:
-                print(f"  1. Update vulnerable packages in {Colors.YELLOW}requirements.txt{Colors.RESET}")
-                print(f"  2. Run '{Colors.GREEN}pip install -r requirements.txt --upgrade{Colors.RESET}' to apply updates")
-                print(f"  3. Test your application after updating dependencies")
+                self._print(f"  1. Update vulnerable packages in {Colors.YELLOW}requirements.txt{Colors.RESET}")
+                self._print(f"  2. Run '{Colors.GREEN}pip install -r requirements.txt --upgrade{Colors.RESET}' to apply updates")
+                self._print(f"  3. Test your application after updating dependencies")
             if ruff_issues > 0:
                 next_num = 4 if (pip_vulns > 0 or safety_vulns > 0) else 1
-                print(f"  {next_num}. Review and fix code security issues identified by Ruff")
+                self._print(f"  {next_num}. Review and fix code security issues identified by Ruff")
             if outdated > 0 and total_issues == 0:
-                print(f"  1. Consider updating outdated packages for latest features and patches")
+                self._print(f"  1. Consider updating outdated packages for latest features and patches")
+    
+    def write_json_report(self, path: Path, results: Dict, counts: Dict[str, int], exit_code: int) -> None:
+        """Write all findings as one JSON document (checks that did not run are null)."""
+        pip_audit = results.get('pip_audit')
+        safety = results.get('safety')
+        ruff = results.get('ruff')
+        report = {
+            'schema': JSON_REPORT_SCHEMA,
+            'timestamp': datetime.now(UTC).isoformat(),
+            'pip_audit': pip_audit[1] if pip_audit else None,
+            'safety': safety[1] if safety else None,
+            'ruff': ruff[1].get('results', []) if ruff else None,
+            'outdated': results.get('outdated'),
+            'summary': counts,
+            'exit_code': exit_code,
+        }
+        path.write_text(json.dumps(report, indent=2))
+        self._print(f"{Colors.BLUE}📝 JSON report written to {path}{Colors.RESET}")
     
     def run_audit(self, deps_only: bool = False, code_only: bool = False, 
-                  quick: bool = False) -> int:
+                  quick: bool = False, deep: bool = False,
+                  json_out: Optional[Path] = None) -> int:
         """Run the security audit."""
-        print(f"{Colors.BOLD}🔒 Security Audit for Meal Planner API{Colors.RESET}")
-        print("=" * 60)
+        self._print(f"{Colors.BOLD}🔒 Security Audit for Meal Planner API{Colors.RESET}\n{'=' * 60}")
         
         pip_vulns = 0
         safety_vulns = 0
         ruff_issues = 0
         outdated_count = 0
         
-        # Quick mode - only run pip-audit
+        # Collect the checks to run; each one mostly waits on its own subprocess
+        checks = {}
         if quick:
-            has_vulns, vulns = self.run_pip_audit()
-            # Count total vulnerabilities, not just packages
-            pip_vulns = sum(len(pkg.get('vulns', [])) for pkg in vulns) if has_vulns else 0
-            self.print_summary(pip_vulns, 0, 0, 0)
-            return 1 if has_vulns else 0
+            # Quick mode - only run pip-audit
+            checks['pip_audit'] = self.run_pip_audit
+        else:
+            if not code_only:
+                checks['pip_audit'] = self.run_pip_audit  # always
+                if deep:
+                    # pip-audit's OSV data already covers most PyUp advisories
+                    checks['safety'] = self.run_safety_check
+                checks['outdated'] = self.check_outdated_packages
+            if not deps_only:
+                checks['ruff'] = self.run_code_security
+        
+        # Run them concurrently, then print the buffered reports in check order
+        # so the output reads the same on every run
+        results = {}
+        outputs = {}
+        with ThreadPoolExecutor(max_workers=max(len(checks), 1)) as executor:
+            futures = {
+                executor.submit(self._run_buffered, check): name
+                for name, check in checks.items()
+            }
+            for future in as_completed(futures):
+                results[futures[future]], outputs[futures[future]] = future.result()
+        
+        for name in checks:
+            sys.stdout.write(outputs[name])
+        sys.stdout.flush()
         
         # Dependency scanning
-        if not code_only:
-            # Run pip-audit (always)
-            has_vulns, vulns = self.run_pip_audit()
-            # Count total vulnerabilities, not just packages
-            pip_vulns = sum(len(pkg.get('vulns', [])) for pkg in vulns) if has_vulns else 0
-            
-            # Run safety check (optional)
-            has_vulns, vulns = self.run_safety_check()
+        if 'pip_audit' in results:
+            _, _, pip_vulns = results['pip_audit']  # Total vulnerabilities, not packages
+        if 'safety' in results:
+            has_vulns, vulns = results['safety']
             safety_vulns = len(vulns) if has_vulns else 0
-            
-            # Check outdated packages
-            outdated = self.check_outdated_packages()
-            outdated_count = len(outdated)
+        if 'outdated' in results:
+            outdated_count = len(results['outdated'])
         
         # Code scanning
-        if not deps_only:
-            has_issues, report = self.run_code_security()
+        if 'ruff' in results:
+            has_issues, report = results['ruff']
             ruff_issues = len(report.get('results', [])) if has_issues else 0
         
         # Print summary
-        self.print_summary(pip_vulns, safety_vulns, ruff_issues, outdated_count)
+        safety_skipped = 'pip_audit' in checks and 'safety' not in checks
+        self._run_and_write(
+            lambda: self.print_summary(
+                pip_vulns, safety_vulns, ruff_issues, outdated_count, safety_skipped
+            )
+        )
+        
+        exit_code = 1 if (pip_vulns + safety_vulns + ruff_issues) > 0 else 0
+        
+        if json_out is not None:
+            counts = {
+                'pip_audit': pip_vulns,
+                'safety': safety_vulns,
+                'ruff': ruff_issues,
+                'outdated': outdated_count,
+            }
+            self.write_json_report(json_out, results, counts, exit_code)
         
         # Return exit code
-        return 1 if (pip_vulns + safety_vulns + ruff_issues) > 0 else 0
+        return exit_code
 
 
 def main():
@@ -384,26 +688,60 @@ def main():
     parser.add_argument(
         '--deps',
         action='store_true',
-        help='Full dependency scan: pip-audit + Safety + outdated packages (skip code scan)'
+        help='Dependency scan: pip-audit + outdated packages (skip code scan)'
+    )
+    parser.add_argument(
+        '--deep',
+        action='store_true',
+        help='Also run Safety alongside pip-audit (slower; mostly the same advisories)'
+    )
+    parser.add_argument(
+        '--max-cache-age',
+        type=float,
+        default=DEFAULT_MAX_CACHE_AGE_HOURS,
+        metavar='HOURS',
+        help=f'Reuse scan results for unchanged requirements/packages for this long '
+             f'(default: {DEFAULT_MAX_CACHE_AGE_HOURS}, 0 disables the cache)'
+    )
+    parser.add_argument(
+        '--refresh-tools',
+        action='store_true',
+        help=f'Rebuild the audit tools venv ({TOOLS_VENV_DIR}) and reinstall pip-audit'
     )
     parser.add_argument(
         '--code',
         action='store_true',
         help='Code security scan only with Ruff (security + quality checks)'
     )
+    parser.add_argument(
+        '--json-out',
+        type=Path,
+        metavar='PATH',
+        help='Also write all findings to PATH as a single JSON report'
+    )
     
     args = parser.parse_args()
     
+    # Plain text when redirected: smaller output and nothing to strip before grepping
+    if not sys.stdout.isatty():
+        Colors.disable()
+    
     # Find project root
     script_path = Path(__file__).resolve()
     project_root = script_path.parent.parent.parent
     
     # Run audit
-    auditor = SecurityAuditor(project_root)
+    auditor = SecurityAuditor(
+        project_root,
+        max_cache_age_hours=args.max_cache_age,
+        refresh_tools=args.refresh_tools
+    )
     return auditor.run_audit(
         deps_only=args.deps,
         code_only=args.code,
-        quick=args.quick
+        quick=args.quick,
+        deep=args.deep,
+        json_out=args.json_out
     )
 
 
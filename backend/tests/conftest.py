@@ -5,18 +5,34 @@ The TEST_DATABASE_URL environment variable is automatically set by the run_tests
 to use the local Docker test database.
 
 Direct pytest usage:
-- Ensure TEST_DATABASE_URL env var is set to TEST_DATABASE_URL_LOCAL
+- Ensure TEST_DATABASE_URL_LOCAL is set in .env (or export TEST_DATABASE_URL)
 - Run: pytest
 
 Using run_tests.py (recommended):
 - python run_tests.py
 """
 
+import os
+
 import pytest
-import bcrypt
+from flask_sqlalchemy.session import Session
+from sqlalchemy import orm
 
+# Pre-generated bcrypt hash of 'password123' at the minimum cost (4), so
+# fixtures never pay for hashing
+TEST_PASSWORD_HASH = '$2b$04$ZlP3Ua6dTbpOpa.wHqJJx.0lBJ/UvmwvSxXM20LAbFs6mgg2Mn.h.'
 
-@pytest.fixture(scope='function')
+
+class _ConnectionSession(Session):
+    """Flask-SQLAlchemy session that always uses the connection it is bound to."""
+    
+    def get_bind(self, *args, **kwargs):
+        # Flask-SQLAlchemy picks binds from its engines and ignores bind=,
+        # which would send test queries around the per-test transaction
+        return self.bind
+
+
+@pytest.fixture(scope='session')
 def app():
     """
     Create a Flask app configured for testing with PostgreSQL.
@@ -24,25 +40,52 @@ def app():
     Uses TEST_DATABASE_URL environment variable which should be set
     by the run_tests.py script to point to the local Docker test database.
     
-    scope='function' means this runs for each test function
+    scope='session' means the app and the tables are created once; each
+    test's changes are rolled back by db_session.
     """
     from app import create_app
     from app.models.database import db
-    from app.models.entities import User
     
     # Create app with test config
-    # The TestingConfig will use TEST_DATABASE_URL which was set by run_tests.py
-    app = create_app('testing')
+    # The TestingConfig will use TEST_DATABASE_URL which was set by run_tests.py.
+    # For plain `pytest`, pass the local test database URL from .env directly
+    # rather than letting TestingConfig fall back to the development database.
+    overrides = {}
+    if not os.environ.get('TEST_DATABASE_URL'):
+        from tests.db_config import get_test_database_url
+        
+        overrides['SQLALCHEMY_DATABASE_URI'] = get_test_database_url()
+    app = create_app('testing', overrides=overrides)
     
     # Create tables in test database
     with app.app_context():
         db.create_all()
-        
-        # Add a test user that already exists
+    
+    yield app
+    
+    # Cleanup: drop all tables after the test session
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture(scope='session')
+def seed_user(app):
+    """
+    Insert the existing test user (password 'password123') once per session.
+    
+    The user is committed outside the per-test transactions, so it survives
+    every rollback. The returned User is detached; read its columns (email,
+    username, ...) but don't use it with db.session.
+    """
+    from app.models.database import db
+    from app.models.entities import User
+    
+    with app.app_context():
         existing_user = User(
             email='existing@test.com',
             username='existinguser',
-            password_hash=bcrypt.hashpw(b'password123', bcrypt.gensalt()).decode('utf-8'),
+            password_hash=TEST_PASSWORD_HASH,
             full_name='Existing User',
             sex='MALE',
             phone_number='555-0001',
@@ -54,22 +97,70 @@ def app():
         )
         db.session.add(existing_user)
         db.session.commit()
+        db.session.refresh(existing_user)
+        db.session.expunge(existing_user)
     
-    yield app
+    return existing_user
+
+
+@pytest.fixture(autouse=True)
+def reset_app_state(app):
+    """
+    Undo per-test changes to the shared app.
+    
+    Tests may tweak app.config (e.g. to enable a cache); those changes and
+    the login rate-limit counters are reset after every test.
+    """
+    from app.utils.rate_limit import limiter
     
-    # Cleanup: drop all tables after test
+    saved_config = dict(app.config)
+    yield
+    app.config.clear()
+    app.config.update(saved_config)
     with app.app_context():
-        db.session.remove()
-        db.drop_all()
+        limiter.reset()
+
+
+@pytest.fixture(scope='function')
+def db_session(app):
+    """
+    Run the test inside a transaction that is rolled back afterwards.
+    
+    db.session is swapped for a session bound to one connection with an open
+    transaction. Commits made by the app only release a SAVEPOINT, so every
+    change the test makes disappears on rollback instead of needing the
+    tables to be dropped and recreated.
+    """
+    from app.models.database import db
+    
+    with app.app_context():
+        connection = db.engine.connect()
+    transaction = connection.begin()
+    
+    original_session = db.session
+    db.session = orm.scoped_session(orm.sessionmaker(
+        class_=_ConnectionSession,
+        db=db,
+        bind=connection,
+        join_transaction_mode='create_savepoint'
+    ))
+    
+    yield db.session
+    
+    db.session.remove()
+    db.session = original_session
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture(scope='function')
-def client(app):
+def client(app, seed_user, db_session):
     """
     Create a test client for making HTTP requests.
     
     This fixture provides a way to make requests to your Flask app
-    without running a real server.
+    without running a real server. The existing test user (seed_user)
+    is always present.
     """
     return app.test_client()
 
@@ -82,25 +173,55 @@ def runner(app):
     return app.test_cli_runner()
 
 
-@pytest.fixture(scope='function')
-def auth_headers(client):
-    """
-    Get authentication headers with a valid JWT token.
-    
-    This fixture logs in a test user and returns headers with the JWT token.
-    """
-    # Login to get token
+def _login_token(client, user) -> str:
+    """Log in as the given seeded user and return the access token."""
     response = client.post('/api/auth/login', 
         json={
-            'login': 'existing@test.com',
+            'login': user.email,
             'password': 'password123'
         }
     )
     
     data = response.get_json()
-    token = data['access_token']
-    
+    return data['access_token']
+
+
+def _bearer_headers(token: str) -> dict:
+    """Build request headers carrying a JWT bearer token."""
     return {
         'Authorization': f'Bearer {token}',
         'Content-Type': 'application/json'
     }
+
+
+@pytest.fixture(scope='session')
+def session_auth_token(app, seed_user):
+    """
+    Log the test user in once per test session.
+    
+    The existing user is committed at session scope, so one token stays
+    valid for every test; the login (and its bcrypt check) runs once.
+    """
+    return _login_token(app.test_client(), seed_user)
+
+
+@pytest.fixture(scope='function')
+def auth_headers(session_auth_token):
+    """
+    Get authentication headers with a valid JWT token.
+    
+    Returns a new dict per test around the shared session token. Tests that
+    revoke their token (logout) must use fresh_auth_headers instead.
+    """
+    return _bearer_headers(session_auth_token)
+
+
+@pytest.fixture(scope='function')
+def fresh_auth_headers(client, seed_user):
+    """
+    Get authentication headers with a newly issued JWT token.
+    
+    This fixture logs in the test user and returns headers with a token
+    that no other test uses, so it is safe to revoke.
+    """
+    return _bearer_headers(_login_token(client, seed_user))
@@ -9,21 +9,48 @@ Usage:
     pytest  # Uses local Docker database
 """
 
+import atexit
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 from dotenv import load_dotenv
 from pathlib import Path
 
-# Load environment variables from .env file in project root (parent directory)
+# .env file in project root (parent directory)
 project_root = Path(__file__).parent.parent.parent  # Go up from tests/ to backend/ to project root/
 env_path = project_root / '.env'
-load_dotenv(env_path)
 
 
-@dataclass
+@lru_cache(maxsize=1)
+def _load_env() -> None:
+    """Load the .env file (once per process, and only when a config is needed)."""
+    load_dotenv(env_path, override=False)
+
+
+# Only the local Docker database is configured here; callers such as
+# scripts/rebuild_db.py pass a target explicitly
+SUPPORTED_TARGETS = ('local',)
+DEFAULT_TARGET = 'local'
+
+# One engine per URL, reused by every validate_connection() call
+_engines = {}
+
+
+def _engine_for(url: str):
+    """Get the engine for url, creating it on first use."""
+    engine = _engines.get(url)
+    if engine is None:
+        from sqlalchemy import create_engine
+        
+        # Pooled connections are reused, so check them before handing one out
+        engine = _engines[url] = create_engine(url, pool_pre_ping=True)
+    return engine
+
+
+@dataclass(frozen=True, slots=True)
 class DatabaseConfig:
-    """Database configuration settings."""
+    """Database configuration settings (read-only once resolved)."""
     name: str
     url: str
     description: str
@@ -35,10 +62,14 @@ class DatabaseConfig:
 class TestDatabaseConfig:
     """Manages test database configuration."""
     
+    # Resolved (and announced) once per process; see clear_cache()
+    _config: Optional[DatabaseConfig] = None
+    
     @classmethod
     def _get_local_config(cls) -> DatabaseConfig:
         """Get local database configuration from environment."""
-        url = os.getenv('TEST_DATABASE_URL_LOCAL')
+        _load_env()
+        url = os.environ.get('TEST_DATABASE_URL_LOCAL')
         if not url:
             raise ValueError(
                 "TEST_DATABASE_URL_LOCAL not found in environment. "
@@ -52,32 +83,54 @@ class TestDatabaseConfig:
         )
     
     @classmethod
-    def get_config(cls) -> DatabaseConfig:
+    def get_config(cls, target: Optional[str] = None) -> DatabaseConfig:
         """
         Get database configuration for local testing.
         
+        The environment is read and the banner printed on the first call only;
+        later calls return the same DatabaseConfig.
+        
+        Args:
+            target: Database target (defaults to DEFAULT_TARGET)
+        
         Returns:
             DatabaseConfig object for the local test database.
         
         Raises:
-            ValueError: If configuration is missing.
+            ValueError: If the target is unsupported or configuration is missing.
         """
-        config = cls._get_local_config()
+        target = (target or DEFAULT_TARGET).lower()
+        if target not in SUPPORTED_TARGETS:
+            raise ValueError(
+                f"Unsupported test database target '{target}'. "
+                f"Supported targets: {', '.join(SUPPORTED_TARGETS)}"
+            )
         
-        print(f"\n🗄️  Using {config.name} database for testing")
-        print(f"   {config.description}")
+        if cls._config is None:
+            cls._config = cls._get_local_config()
+            
+            print(f"\n🗄️  Using {cls._config.name} database for testing")
+            print(f"   {cls._config.description}")
         
-        return config
+        return cls._config
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget the resolved configuration so the next call re-reads the environment."""
+        cls._config = None
     
     @classmethod
-    def get_database_url(cls) -> str:
+    def get_database_url(cls, target: Optional[str] = None) -> str:
         """
         Get database URL for local testing.
         
+        Args:
+            target: Database target (defaults to DEFAULT_TARGET)
+        
         Returns:
             Database URL string
         """
-        return cls.get_config().url
+        return cls.get_config(target).url
     
     @classmethod
     def validate_connection(cls) -> bool:
@@ -87,11 +140,11 @@ class TestDatabaseConfig:
         Returns:
             True if connection successful, raises exception otherwise
         """
-        from sqlalchemy import create_engine, text
+        from sqlalchemy import text
         from sqlalchemy.exc import OperationalError
         
         config = cls.get_config()
-        engine = create_engine(config.url)
+        engine = _engine_for(config.url)
         
         try:
             with engine.connect() as conn:
@@ -101,10 +154,24 @@ class TestDatabaseConfig:
         except OperationalError as e:
             print(f"   ❌ Failed to connect to {config.name} database")
             raise e
-        finally:
+    
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Dispose of the engines cached by validate_connection().
+        
+        Registered with atexit. It is safe to call earlier (or twice); a later
+        validate_connection() just creates a fresh engine.
+        """
+        while _engines:
+            _, engine = _engines.popitem()
             engine.dispose()
 
 
+# Close pooled connections once, when the process exits
+atexit.register(TestDatabaseConfig.shutdown)
+
+
 # Convenience function for quick access
 def get_test_database_url() -> str:
     """Get test database URL for local testing."""
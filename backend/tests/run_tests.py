@@ -13,15 +13,20 @@ Usage:
 
 import sys
 import os
-import subprocess
 import argparse
 from pathlib import Path
 
+import pytest
+
 # Add backend directory to path to import test modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from tests.db_config import TestDatabaseConfig
 
+# pytest options that read or write the .pytest_cache directory
+CACHE_OPTIONS = ('--lf', '--last-failed', '--ff', '--failed-first', '--nf', '--new-first',
+                 '--sw', '--stepwise', '--sw-skip', '--stepwise-skip', '--cache-show', '--cache-clear')
+
 
 def check_database_connection():
     """Check connection to the local test database."""
@@ -38,18 +43,10 @@ def check_database_connection():
 
 def run_tests(args):
     """Run pytest with the specified configuration."""
-    import os
-    from dotenv import load_dotenv
-    from pathlib import Path
-    
-    # Load .env file
-    project_root = Path(__file__).parent.parent.parent
-    env_path = project_root / '.env'
-    load_dotenv(env_path)
-    
-    # Set TEST_DATABASE_URL to local database
-    local_url = os.getenv('TEST_DATABASE_URL_LOCAL')
-    if not local_url:
+    # Set TEST_DATABASE_URL to local database (db_config loads .env)
+    try:
+        local_url = TestDatabaseConfig.get_database_url()
+    except ValueError:
         print("❌ TEST_DATABASE_URL_LOCAL not found in .env file")
         return 1
     os.environ['TEST_DATABASE_URL'] = local_url
@@ -63,9 +60,15 @@ def run_tests(args):
     if args.verbose:
         pytest_args.append('-v')
     
-    # Add coverage report
+    # Add coverage report (otherwise don't load the coverage plugin at all)
     if args.coverage:
         pytest_args.extend(['--cov=app', '--cov-report=term-missing'])
+    else:
+        pytest_args.extend(['-p', 'no:cov'])
+    
+    # Skip .pytest_cache reads/writes unless an option needs them
+    if not any(arg.split('=')[0] in CACHE_OPTIONS for arg in args.pytest_args or []):
+        pytest_args.extend(['-p', 'no:cacheprovider'])
     
     # Add specific test file or directory
     if args.file:
@@ -77,13 +80,13 @@ def run_tests(args):
     
     print(f"📝 Command: {' '.join(pytest_args)}\n")
     
-    # Run pytest
-    result = subprocess.run(pytest_args)
-    return result.returncode
+    # Run pytest in this process: TEST_DATABASE_URL is already in os.environ
+    # and no second interpreter has to start up
+    return int(pytest.main(pytest_args[1:]))
 
 
-def main():
-    """Main entry point."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
     parser = argparse.ArgumentParser(
         description='Run Meal Planner API tests with local Docker database',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -124,7 +127,21 @@ Examples:
         help='Additional arguments to pass to pytest (use -- before pytest args)'
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+# Built once at import and reused by every main() call
+_PARSER = _build_parser()
+
+
+def main(argv=None):
+    """
+    Main entry point.
+    
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
+    args = _PARSER.parse_args(argv)
     
     # Remove -- from pytest args if present
     if args.pytest_args and args.pytest_args[0] == '--':
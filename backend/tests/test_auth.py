@@ -8,10 +8,38 @@ How pytest works:
 4. If any assertion fails, the test fails
 """
 
+import time
+
 import pytest
 import json
 
 
+# A valid registration; tests override only the fields they exercise
+REGISTRATION_DATA = {
+    'email': 'test@test.com',
+    'username': 'testuser',
+    'password': 'ValidPass123',
+    'full_name': 'Test User',
+    'sex': 'MALE',
+    'phone_number': '555-1234',
+    'address_line_1': '123 Test St',
+    'city': 'Test City',
+    'state_province_code': 'TC',
+    'country_code': 'US',
+    'postal_code': '12345'
+}
+
+# Registrations that fail validation (see test_register_rejected)
+WEAK_PASSWORD_DATA = {**REGISTRATION_DATA, 'password': 'weak'}  # Too short, no numbers
+MISSING_FIELDS_DATA = {
+    'email': 'test@test.com',
+    'username': 'testuser'
+    # Missing password and other required fields
+}
+INVALID_EMAIL_DATA = {**REGISTRATION_DATA, 'email': 'not-an-email'}
+INVALID_SEX_DATA = {**REGISTRATION_DATA, 'sex': 'INVALID'}  # Not MALE, FEMALE, or OTHER
+
+
 class TestAuthentication:
     """Group authentication tests in a class for organization."""
     
@@ -24,17 +52,11 @@ class TestAuthentication:
         """
         # Arrange: Prepare test data
         new_user_data = {
+            **REGISTRATION_DATA,
             'email': 'newuser@test.com',
             'username': 'newuser-123',  # Testing hyphen in username
-            'password': 'SecurePass123',
             'full_name': 'New Test User',
-            'sex': 'FEMALE',
-            'phone_number': '555-1234',
-            'address_line_1': '456 New St',
-            'city': 'New City',
-            'state_province_code': 'NC',
-            'country_code': 'us',  # Testing lowercase (should be uppercased)
-            'postal_code': '54321'
+            'country_code': 'us'  # Testing lowercase (should be uppercased)
         }
         
         # Act: Make the request
@@ -58,77 +80,38 @@ class TestAuthentication:
         assert 'password' not in data['user']  # Password should never be returned
         assert 'password_hash' not in data['user']
     
-    def test_register_duplicate_email_fails(self, client):
-        """Test that registering with existing email fails."""
-        # Try to register with existing email
-        duplicate_data = {
-            'email': 'existing@test.com',  # This user exists in fixtures
-            'username': 'different_username',
-            'password': 'Password123',
-            'full_name': 'Another User',
-            'sex': 'MALE',
-            'phone_number': '555-9999',
-            'address_line_1': '789 Street',
-            'city': 'City',
-            'state_province_code': 'ST',
-            'country_code': 'US',
-            'postal_code': '11111'
-        }
-        
-        response = client.post('/api/auth/register', json=duplicate_data)
-        
-        assert response.status_code == 400
-        data = response.get_json()
-        assert 'error' in data
-        assert 'Email already registered' in data['error']
-    
-    def test_register_duplicate_username_fails(self, client):
-        """Test that registering with existing username fails."""
-        duplicate_data = {
-            'email': 'different@test.com',
-            'username': 'existinguser',  # This username exists in fixtures
-            'password': 'Password123',
-            'full_name': 'Another User',
-            'sex': 'OTHER',
-            'phone_number': '555-8888',
-            'address_line_1': '321 Avenue',
-            'city': 'Town',
-            'state_province_code': 'TW',
-            'country_code': 'US',
-            'postal_code': '22222'
-        }
+    @pytest.mark.parametrize('field, error', [
+        ('email', 'Email already registered'),
+        ('username', 'Username already taken'),
+    ])
+    def test_register_duplicate_fails(self, client, seed_user, field, error):
+        """Test that registering with the existing user's email or username fails."""
+        duplicate_data = {**REGISTRATION_DATA, field: getattr(seed_user, field)}
         
         response = client.post('/api/auth/register', json=duplicate_data)
         
         assert response.status_code == 400
         data = response.get_json()
         assert 'error' in data
-        assert 'Username already taken' in data['error']
+        assert error in data['error']
     
-    def test_register_invalid_password_fails(self, client):
-        """Test that weak password is rejected."""
-        invalid_data = {
-            'email': 'test@test.com',
-            'username': 'testuser',
-            'password': 'weak',  # Too short, no numbers
-            'full_name': 'Test User',
-            'sex': 'MALE',
-            'phone_number': '555-7777',
-            'address_line_1': '111 Street',
-            'city': 'City',
-            'state_province_code': 'ST',
-            'country_code': 'US',
-            'postal_code': '33333'
-        }
+    @pytest.mark.parametrize('payload', [
+        pytest.param(WEAK_PASSWORD_DATA, id='weak_password'),
+        pytest.param(MISSING_FIELDS_DATA, id='missing_fields'),
+        pytest.param(INVALID_EMAIL_DATA, id='invalid_email'),
+        pytest.param(INVALID_SEX_DATA, id='invalid_sex'),
+    ])
+    def test_register_rejected(self, client, payload):
+        """Test that registrations failing validation are rejected with 422."""
+        response = client.post('/api/auth/register', json=payload)
         
-        response = client.post('/api/auth/register', json=invalid_data)
-        
-        assert response.status_code == 422  # Validation error for invalid password
+        assert response.status_code == 422  # Validation error
     
-    def test_login_with_email_success(self, client):
-        """Test successful login with email."""
+    @pytest.mark.parametrize('field', ['email', 'username'])
+    def test_login_success(self, client, seed_user, field):
+        """Test successful login with either email or username."""
         login_data = {
-            'login': 'existing@test.com',
+            'login': getattr(seed_user, field),
             'password': 'password123'
         }
         
@@ -137,68 +120,96 @@ class TestAuthentication:
         assert response.status_code == 200
         data = response.get_json()
         assert 'access_token' in data
-        assert data['user']['email'] == 'existing@test.com'
-        assert data['user']['username'] == 'existinguser'
+        assert data['user']['email'] == seed_user.email
+        assert data['user']['username'] == seed_user.username
     
-    def test_login_with_username_success(self, client):
-        """Test successful login with username."""
-        login_data = {
-            'login': 'existinguser',
-            'password': 'password123'
-        }
-        
+    @pytest.mark.parametrize('login_data', [
+        pytest.param({'login': 'existing@test.com', 'password': 'wrongpassword'}, id='wrong_password'),
+        pytest.param({'login': 'nonexistent@test.com', 'password': 'anypassword'}, id='nonexistent_user'),
+    ])
+    def test_login_invalid_credentials_fails(self, client, login_data):
+        """Test that a wrong password and an unknown user get the same 401."""
         response = client.post('/api/auth/login', json=login_data)
         
-        assert response.status_code == 200
+        assert response.status_code == 401
         data = response.get_json()
-        assert 'access_token' in data
-        assert data['user']['username'] == 'existinguser'
+        assert 'error' in data
+        assert 'Invalid credentials' in data['error']
     
-    def test_login_wrong_password_fails(self, client):
-        """Test login with wrong password."""
+    def test_login_with_verify_password_cache(self, app, client):
+        """Test that cached password verifications still reject wrong passwords."""
+        app.config['USE_VERIFY_PASSWORD_CACHE'] = True
         login_data = {
             'login': 'existing@test.com',
-            'password': 'wrongpassword'
+            'password': 'password123'
         }
         
-        response = client.post('/api/auth/login', json=login_data)
+        assert client.post('/api/auth/login', json=login_data).status_code == 200
+        assert client.post('/api/auth/login', json=login_data).status_code == 200
         
-        assert response.status_code == 401
-        data = response.get_json()
-        assert 'error' in data
-        assert 'Invalid credentials' in data['error']
+        login_data['password'] = 'wrongpassword'
+        assert client.post('/api/auth/login', json=login_data).status_code == 401
     
-    def test_login_nonexistent_user_fails(self, client):
-        """Test login with non-existent user."""
+    def test_login_rate_limited(self, app, client):
+        """Test that repeated logins from one client are rejected with 429."""
+        app.config['LOGIN_RATE_LIMIT'] = '2/minute'
         login_data = {
-            'login': 'nonexistent@test.com',
-            'password': 'anypassword'
+            'login': 'existing@test.com',
+            'password': 'wrongpassword'
         }
         
+        assert client.post('/api/auth/login', json=login_data).status_code == 401
+        assert client.post('/api/auth/login', json=login_data).status_code == 401
+        
         response = client.post('/api/auth/login', json=login_data)
         
-        assert response.status_code == 401
-        data = response.get_json()
-        assert 'error' in data
-        assert 'Invalid credentials' in data['error']
+        assert response.status_code == 429
+        assert 'Rate limit exceeded' in response.get_json()['error']
     
-    def test_get_profile_with_token_success(self, client, auth_headers):
+    def test_get_profile_with_token_success(self, client, seed_user, auth_headers):
         """
         Test getting user profile with valid JWT token.
         
         Args:
             client: Test client fixture
+            seed_user: The existing user the token belongs to
             auth_headers: Authentication headers fixture with JWT token
         """
         response = client.get('/api/auth/profile', headers=auth_headers)
         
         assert response.status_code == 200
         data = response.get_json()
-        assert data['email'] == 'existing@test.com'
-        assert data['username'] == 'existinguser'
+        assert data['email'] == seed_user.email
+        assert data['username'] == seed_user.username
         assert 'password' not in data
         assert 'password_hash' not in data
     
+    def test_get_profile_with_cached_token_success(self, app, client, auth_headers):
+        """Test that repeated requests with the same token are served from the JWT cache."""
+        app.config['AUTH_CACHE_ENABLED'] = True
+        
+        first = client.get('/api/auth/profile', headers=auth_headers)
+        second = client.get('/api/auth/profile', headers=auth_headers)
+        
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.get_json() == first.get_json()
+        assert len(app.extensions['flask-jwt-extended']._token_cache) == 1
+    
+    def test_get_profile_not_modified_with_etag(self, client, auth_headers):
+        """Test that a matching If-None-Match returns 304 without a body."""
+        first = client.get('/api/auth/profile', headers=auth_headers)
+        etag = first.headers['ETag']
+        
+        response = client.get(
+            '/api/auth/profile',
+            headers={**auth_headers, 'If-None-Match': etag}
+        )
+        
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+    
     def test_get_profile_without_token_fails(self, client):
         """Test that profile endpoint requires authentication."""
         response = client.get('/api/auth/profile')
@@ -220,66 +231,36 @@ class TestAuthentication:
         data = response.get_json()
         assert 'msg' in data
     
-    def test_logout_with_token_success(self, client, auth_headers):
+    def test_logout_with_token_success(self, client, fresh_auth_headers):
         """Test logout endpoint with valid token."""
-        response = client.post('/api/auth/logout', headers=auth_headers)
+        response = client.post('/api/auth/logout', headers=fresh_auth_headers)
         
         assert response.status_code == 200
         data = response.get_json()
         assert 'message' in data
         assert 'Logout successful' in data['message']
     
-    def test_register_missing_required_fields_fails(self, client):
-        """Test registration with missing required fields."""
-        incomplete_data = {
-            'email': 'test@test.com',
-            'username': 'testuser'
-            # Missing password and other required fields
-        }
+    def test_token_rejected_after_logout(self, client, fresh_auth_headers):
+        """Test that a token cannot be used again after logging out with it."""
+        assert client.post('/api/auth/logout', headers=fresh_auth_headers).status_code == 200
         
-        response = client.post('/api/auth/register', json=incomplete_data)
+        response = client.get('/api/auth/profile', headers=fresh_auth_headers)
         
-        assert response.status_code == 422  # Unprocessable Entity
+        assert response.status_code == 401
+        assert 'msg' in response.get_json()
     
-    def test_register_invalid_email_format_fails(self, client):
-        """Test registration with invalid email format."""
-        invalid_email_data = {
-            'email': 'not-an-email',
-            'username': 'testuser',
-            'password': 'ValidPass123',
-            'full_name': 'Test User',
-            'sex': 'MALE',
-            'phone_number': '555-1234',
-            'address_line_1': '123 Test St',
-            'city': 'Test City',
-            'state_province_code': 'TC',
-            'country_code': 'US',
-            'postal_code': '12345'
-        }
+    def test_token_stays_revoked_when_denylist_grows(self, app, client, fresh_auth_headers):
+        """Test that revoking more tokens than the cache size never un-revokes earlier ones."""
+        assert client.post('/api/auth/logout', headers=fresh_auth_headers).status_code == 200
         
-        response = client.post('/api/auth/register', json=invalid_email_data)
+        jwt_manager = app.extensions['flask-jwt-extended']
+        exp = time.time() + 3600
+        for i in range(app.config['AUTH_CACHE_MAXSIZE'] + 1):
+            jwt_manager.revoke_token({'jti': f'other-token-{i}', 'exp': exp})
         
-        assert response.status_code == 422  # Validation error
-    
-    def test_register_invalid_sex_value_fails(self, client):
-        """Test registration with invalid sex enum value."""
-        invalid_sex_data = {
-            'email': 'test@test.com',
-            'username': 'testuser',
-            'password': 'ValidPass123',
-            'full_name': 'Test User',
-            'sex': 'INVALID',  # Not MALE, FEMALE, or OTHER
-            'phone_number': '555-1234',
-            'address_line_1': '123 Test St',
-            'city': 'Test City',
-            'state_province_code': 'TC',
-            'country_code': 'US',
-            'postal_code': '12345'
-        }
+        response = client.get('/api/auth/profile', headers=fresh_auth_headers)
         
-        response = client.post('/api/auth/register', json=invalid_sex_data)
-        
-        assert response.status_code == 422  # Validation error
+        assert response.status_code == 401
     
     def test_login_empty_credentials_fails(self, client):
         """Test login with empty credentials."""